@@ -210,6 +210,11 @@ exports.deleteAssistantSession = catchAsync(async (req, res) => {
 exports.getAssistantStats = catchAsync(async (req, res) => {
   const userId = req.user._id;
 
+  // Bucketed sessions keep their messages in message_buckets and have no QnA
+  const sessionMessages = {
+    $add: [{ $ifNull: ["$messageCount", 0] }, { $size: { $ifNull: ["$QnA", []] } }],
+  };
+
   try {
     const stats = await Assistant.aggregate([
       { $match: { user: userId } },
@@ -217,12 +222,12 @@ exports.getAssistantStats = catchAsync(async (req, res) => {
         $group: {
           _id: null,
           totalSessions: { $sum: 1 },
-          totalMessages: { $sum: { $size: "$QnA" } },
-          averageMessagesPerSession: { $avg: { $size: "$QnA" } },
+          totalMessages: { $sum: sessionMessages },
+          averageMessagesPerSession: { $avg: sessionMessages },
           subjectBreakdown: {
             $push: {
               subject: "$subject",
-              messageCount: { $size: "$QnA" },
+              messageCount: sessionMessages,
               createdAt: "$createdAt",
             },
           },
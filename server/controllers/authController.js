@@ -2,6 +2,7 @@ const User = require("../models/userModel");
 const jwt = require("jsonwebtoken");
 const sendEmail = require("../utils/email");
 const generateAuthToken = require("../jwt/jsonWebToken");
+const invalidateUserCache = require("../utils/userCache");
 const crypto = require("crypto");
 const path = require("path");
 const upload = require(path.join(
@@ -225,6 +226,7 @@ exports.resetPassword = async (req, res) => {
     user.passwordResetToken = undefined;
     user.passwordResetExpires = undefined;
     await user.save();
+    invalidateUserCache(user._id);
 
     generateAuthToken(user._id, res);
     res.status(200).json({
@@ -272,6 +274,7 @@ exports.updatePassword = async (req, res) => {
 
     user.password = newPassword;
     await user.save();
+    invalidateUserCache(user._id);
     generateAuthToken(user._id, res);
     res.status(200).json({
       success: true,
@@ -357,6 +360,7 @@ exports.updateProfile = [
       user.resume = req.files.resume[0].path;
     }
     await user.save();
+    invalidateUserCache(user._id);
     res.status(200).json({
       success: true,
       message: "Profile updated successfully",
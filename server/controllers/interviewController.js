@@ -169,7 +169,12 @@ exports.getInterviewStats = catchAsync(async (req, res) => {
         _id: null,
         totalInterviews: { $sum: 1 },
         averageScore: { $avg: "$score" },
-        totalQuestions: { $sum: { $size: "$QnA" } },
+        // Bucketed interviews count their migrated messages in messageCount
+        totalQuestions: {
+          $sum: {
+            $add: [{ $ifNull: ["$messageCount", 0] }, { $size: { $ifNull: ["$QnA", []] } }],
+          },
+        },
         domainBreakdown: {
           $push: {
             domain: "$domain",
@@ -3,6 +3,7 @@ const QuizHistory = require("../models/quizHistoryModel");
 const Interview = require("../models/interviewModel");
 const { catchAsync } = require("../utils/catchAsync");
 const cloudinary = require("../config/cloudinaryConfig");
+const invalidateUserCache = require("../utils/userCache");
 
 // Get comprehensive streak statistics
 exports.getStreakStats = async (req, res) => {
@@ -243,6 +244,7 @@ exports.uploadResume = catchAsync(async (req, res) => {
       { resume: result.secure_url },
       { new: true }
     ).select("-password");
+    invalidateUserCache(userId);
 
     res.status(200).json({
       success: true,
@@ -311,6 +313,7 @@ exports.deleteResume = catchAsync(async (req, res) => {
 
     // Update user to remove resume URL
     await User.findByIdAndUpdate(userId, { resume: null });
+    invalidateUserCache(userId);
 
     res.status(200).json({
       success: true,
@@ -0,0 +1,23 @@
+const jwt = require("jsonwebtoken");
+const pythonAPI = require("./pythonAPI");
+
+// Must match INTERNAL_TOKEN_SCOPE in services/auth.py
+const INTERNAL_TOKEN_SCOPE = "user-cache:invalidate";
+
+// Tell the Python services to drop their cached copy of a user after it changes.
+// Best effort: if the call fails, the services' AUTH_CACHE_TTL_SECONDS bounds the staleness.
+const invalidateUserCache = (userId) => {
+  const token = jwt.sign({ scope: INTERNAL_TOKEN_SCOPE }, process.env.JWT_SECRET, {
+    expiresIn: "1m",
+  });
+  return pythonAPI
+    .post(`/api/v1/internal/users/${userId}/invalidate`, null, {
+      headers: { Authorization: `Bearer ${token}` },
+      timeout: 5000,
+    })
+    .catch((error) => {
+      console.error("Failed to invalidate services user cache:", error.message);
+    });
+};
+
+module.exports = invalidateUserCache;
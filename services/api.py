@@ -1,14 +1,44 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from routes.interview_routes import interview_router
 from routes.assistant_routes import assistant_router
+from routes.job_routes import job_router
+from routes.internal_routes import internal_router
 from auth import require_auth
+from database.db_config import connect_to_database, close_database_connection, get_database
+from utils.llm_gateway import close_llm_clients
+from utils.document_executor import shutdown_document_executor
+from utils.job_queue import start_job_workers, stop_job_workers
+from database.indexes import DB_ENSURE_INDEXES, ensure_indexes
+from controllers.assistant_controller import start_daily_question_worker, stop_daily_question_worker
 
 # Security scheme for Swagger UI
 security = HTTPBearer()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled Mongo client for the whole process
+    connect_to_database()
+    # Every hot-path index from the manifest in database/indexes.py; idempotent
+    if DB_ENSURE_INDEXES:
+        try:
+            await ensure_indexes(await get_database())
+        except Exception as e:
+            print(f"Error creating indexes: {str(e)}")
+    # Keep the daily-question pool filled ahead so quiz reads never wait on the model
+    await start_daily_question_worker()
+    # Bounded worker pool for slow model calls submitted as background jobs
+    await start_job_workers()
+    yield
+    await stop_job_workers()
+    await stop_daily_question_worker()
+    await close_llm_clients()
+    shutdown_document_executor()
+    close_database_connection()
+
 api = FastAPI(
     root_path="/services",
     title="Mini Project FastAPI Services",
@@ -31,6 +61,7 @@ api = FastAPI(
     # Explicitly set docs URL paths
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Allow CORS for all origins    
@@ -51,6 +82,7 @@ def root():
         "endpoints": {
             "interview": "/api/v1/interview",
             "assistant": "/api/v1/assistant", 
+            "jobs": "/api/v1/jobs",
             "docs": "/docs",
             "auth_test": "/auth-test"
         }
@@ -71,6 +103,8 @@ async def test_authentication(current_user: dict = Depends(require_auth)):
 
 api.include_router(interview_router, prefix = "/api/v1/interview", tags=["interview"])
 api.include_router(assistant_router, prefix = "/api/v1/assistant", tags=["assistant"])
+api.include_router(job_router, prefix = "/api/v1/jobs", tags=["jobs"])
+api.include_router(internal_router, prefix = "/api/v1/internal", tags=["internal"])
 
 if __name__ == "__main__":
     import uvicorn
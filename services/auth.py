@@ -1,11 +1,14 @@
 import jwt
 import os
+import time
+import hashlib
 from fastapi import HTTPException, Request, status, Depends
 from fastapi.security import APIKeyCookie, HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from database.db_config import get_database
 from bson import ObjectId
 from typing import Optional
+from utils.cache import LRUCache
 
 load_dotenv()
 
@@ -14,6 +17,27 @@ SECRET_KEY = os.getenv("JWT_SECRET", "this_is_the_JWT_secret_123_mini")
 ALGORITHM = "HS256"
 COOKIE_NAME = "jwt"
 
+# Verified token -> user projection cache, so repeated requests skip the users lookup
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+_user_cache = LRUCache(max_entries=AUTH_CACHE_MAX_ENTRIES, ttl=AUTH_CACHE_TTL_SECONDS)
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def invalidate_user_cache(user_id: str = None):
+    """
+    Drop cached users so the next request reloads them from the database.
+    Clears only the given user's entries, or everything when user_id is None.
+    The Node.js server calls it after user writes through
+    POST /api/v1/internal/users/{user_id}/invalidate; AUTH_CACHE_TTL_SECONDS
+    bounds the staleness if that call is lost.
+    """
+    if user_id is None:
+        _user_cache.clear()
+        return
+    _user_cache.delete_where(lambda user: user.get("_id") == str(user_id))
+
 # Security schemes for Swagger UI
 api_key_cookie = APIKeyCookie(name=COOKIE_NAME, auto_error=False)
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -21,7 +45,8 @@ bearer_scheme = HTTPBearer(auto_error=False)
 async def get_current_user(
     token: str = Depends(api_key_cookie), 
     bearer_token: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    request: Request = None
+    request: Request = None,
+    db = Depends(get_database)
 ) -> Optional[dict]:
     """
     Extract and validate JWT token from cookies or Authorization header.
@@ -51,6 +76,11 @@ async def get_current_user(
     if token is None:
         return None
 
+    cache_key = _token_cache_key(token)
+    cached_user = _user_cache.get(cache_key)
+    if cached_user is not None:
+        return dict(cached_user)
+
     try:
         # Verify and decode the JWT token (compatible with Node.js)
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -60,7 +90,6 @@ async def get_current_user(
             raise credentials_exception
 
         # Get user from database
-        db = await get_database()
         user_collection = db['users']
         
         try:
@@ -82,6 +111,13 @@ async def get_current_user(
         
         # Convert ObjectId to string for JSON serialization
         user["_id"] = str(user["_id"])
+        
+        # Never cache past the token's own expiry
+        ttl = AUTH_CACHE_TTL_SECONDS
+        if payload.get("exp") is not None:
+            ttl = min(ttl, payload["exp"] - time.time())
+        if ttl > 0:
+            _user_cache.set(cache_key, dict(user), ttl=ttl)
         return user
         
     except jwt.ExpiredSignatureError:
@@ -118,3 +154,23 @@ async def optional_auth(current_user: dict = Depends(get_current_user)) -> Optio
     Returns user if authenticated, None otherwise.
     """
     return current_user
+
+# Scope claim of the short-lived tokens the Node.js server signs for internal calls
+INTERNAL_TOKEN_SCOPE = "user-cache:invalidate"
+
+async def require_internal(bearer_token: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> dict:
+    """
+    Dependency for internal endpoints called by the Node.js server.
+    Accepts only tokens signed with the shared JWT secret that carry the
+    internal scope, so user session tokens are rejected.
+    """
+    forbidden = HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Internal token required.")
+    if not bearer_token or not bearer_token.credentials:
+        raise forbidden
+    try:
+        payload = jwt.decode(bearer_token.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
+        raise forbidden
+    if payload.get("scope") != INTERNAL_TOKEN_SCOPE:
+        raise forbidden
+    return payload
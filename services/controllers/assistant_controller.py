@@ -1,21 +1,39 @@
-from groq import Groq
 from dotenv import load_dotenv
 import os
+import asyncio
 import datetime
-import json
-import re
 from datetime import timezone, timedelta
 from fastapi import HTTPException
 from bson import ObjectId
 import traceback
+import uuid
+from pymongo.errors import DuplicateKeyError
 from database.db_config import get_database
-from utils.helper import extract_json_objects, extract_text
-from models.prompts import daily_questions_prompt, resume_prompt, study_assistant_prompt
+from utils.helper import format_sse
+from utils.resume_cache import get_resume_text
+from utils.answer_cache import get_cached_answer, store_answer
+from utils.llm_gateway import chat_completion, stream_chat_completion
+from utils.structured_output import structured_completion, StructuredOutputError
+from utils.job_queue import register_job
+from utils.message_store import MESSAGE_BUCKETS, append_messages, recent_messages
+from utils.prompt_builder import build_prompt
+from utils.question_index import MinHashIndex, get_question_index
+from models.prompt_registry import get_prompt
+from models.response_model import DailyQuestionItem, DailyQuestionsResponse, ResumeAnalysisResponse
+from pydantic import ValidationError
 
 load_dotenv()
 groq_api_key_dq = os.getenv("GROQ_API_KEY_DQ")
-client = Groq(api_key = groq_api_key_dq)
-study = Groq(api_key=groq_api_key_dq)
+STUDY_HISTORY_TURNS = int(os.getenv("STUDY_HISTORY_TURNS", "5"))
+DQ_MAX_PARALLEL_SUBJECTS = int(os.getenv("DQ_MAX_PARALLEL_SUBJECTS", "6"))
+DQ_QUESTIONS_PER_SUBJECT = int(os.getenv("DQ_QUESTIONS_PER_SUBJECT", "10"))
+DQ_POOL_DAYS_AHEAD = int(os.getenv("DQ_POOL_DAYS_AHEAD", "3"))
+DQ_GENERATION_ATTEMPTS = int(os.getenv("DQ_GENERATION_ATTEMPTS", "3"))
+# Opt-in: run the worker in one process (or a dedicated one), not in every uvicorn worker
+DQ_POOL_WORKER = os.getenv("DQ_POOL_WORKER", "false").lower() == "true"
+DQ_POOL_REFRESH_SECONDS = float(os.getenv("DQ_POOL_REFRESH_SECONDS", "3600"))
+DQ_POOL_LEASE_SECONDS = float(os.getenv("DQ_POOL_LEASE_SECONDS", "600"))
+_pool_worker = None
 
 textbook = {
     "ADA":"The Design and Analysis of Algorithms, by Anany Levitan",
@@ -26,98 +44,344 @@ textbook = {
     "DS":"Data Structures and Algorithms in Java, by Robert Lafore", 
 }
 
-async def get_daily_questions():
-    try:
-        subjects = ["Data Structures", "operating systems", "computer networks", "database management systems", "software engineering", "algorithm design and analysis"]
-        daily_questions = []
-        db = await get_database()
-        for subject in subjects:
-            collection = db['dqs']
-            existing_questions = await collection.find({'subject': subject}).to_list(length=30)
-            existing_questions_list = [q['question'] for q in existing_questions]  
-            response  = client.chat.completions.create(
+SUBJECTS = ["Data Structures", "operating systems", "computer networks", "database management systems", "software engineering", "algorithm design and analysis"]
+IST = timezone(timedelta(hours=5, minutes=30))
+
+def ist_date(days_ahead: int = 0) -> str:
+    """
+    The IST calendar date, as stored in the `date` field of `dqs`.
+    """
+    return str(datetime.datetime.now(IST).date() + timedelta(days=days_ahead))
+
+def _salvage_questions(data) -> list:
+    """
+    Keep the individually valid questions from a batch that failed validation.
+    """
+    items = data.get('questions') if isinstance(data, dict) else None
+    valid = []
+    for item in items if isinstance(items, list) else []:
+        try:
+            valid.append(DailyQuestionItem.model_validate(item))
+        except ValidationError:
+            continue
+    return valid
+
+async def _generate_subject_questions(subject: str, date: str, limiter: asyncio.Semaphore):
+    """
+    Generate, validate and tag the daily questions for a single subject.
+    """
+    async with limiter:
+        prompt, _ = build_prompt(get_prompt("daily_questions"), subject=subject)
+        try:
+            result = await structured_completion(
+                groq_api_key_dq,
+                DailyQuestionsResponse,
                 model = "meta-llama/llama-4-scout-17b-16e-instruct",
                 messages = [
                     {
                         "role" : "system",
-                        "content" : daily_questions_prompt.format(subject=subject, list=existing_questions_list)
+                        "content" : prompt
                         
                     },
                 ]
             )
-            questions = extract_json_objects(response.choices[0].message.content)              
-            for question in questions:
-                question['subject'] = subject
-                # Get current date in IST (UTC+5:30)
-                ist_timezone = timezone(timedelta(hours=5, minutes=30))
-                ist_date = datetime.datetime.now(ist_timezone).date()
-                question['date'] = str(ist_date)
-                daily_questions.append(question)
-        if not daily_questions:
-            raise HTTPException(status_code=404, detail="No daily questions generated.")    
-        await collection.insert_many(daily_questions)
-        return {"message": "Daily questions successfully stored  in the database."}
+            items = result.questions
+        except StructuredOutputError as e:
+            items = _salvage_questions(e.data)
+            print(f"Kept {len(items)} valid daily questions for {subject} after repair: {str(e)}")
+    if not items:
+        raise ValueError(f"No valid questions generated for {subject}.")
+    questions = []
+    for item in items:
+        question = item.model_dump()
+        question['subject'] = subject
+        question['date'] = date
+        questions.append(question)
+    return questions
+
+async def _claim_lease(leases, key: str, owner: str) -> bool:
+    """
+    Take the lease on one (subject, date) set, unless another process holds
+    an unexpired one. The upsert fails on the existing `_id` while it is held.
+    """
+    now = datetime.datetime.now(timezone.utc)
+    try:
+        await leases.update_one(
+            {'_id': key, 'expiresAt': {'$lte': now}},
+            {'$set': {'owner': owner, 'expiresAt': now + timedelta(seconds=DQ_POOL_LEASE_SECONDS)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+async def _top_up_subject(collection, subject: str, date: str, limiter: asyncio.Semaphore) -> int:
+    """
+    Bring one subject's set for `date` up to DQ_QUESTIONS_PER_SUBJECT,
+    keeping only questions that are not near-duplicates of the pool.
+    Only the process holding the set's lease tops it up, so concurrent
+    workers and POSTs never fill it twice. Returns the number of questions stored.
+    """
+    leases = collection.database['dq_leases']
+    key = f"{subject}:{date}"
+    owner = uuid.uuid4().hex
+    if not await _claim_lease(leases, key, owner):
+        print(f"Daily questions for {subject} on {date} are being generated by another worker")
+        return 0
+    try:
+        return await _fill_subject(collection, subject, date, limiter)
+    finally:
+        await leases.delete_one({'_id': key, 'owner': owner})
+
+async def _fill_subject(collection, subject: str, date: str, limiter: asyncio.Semaphore) -> int:
+    have = await collection.count_documents({'subject': subject, 'date': date})
+    if have >= DQ_QUESTIONS_PER_SUBJECT:
+        return 0
+    index = await get_question_index(collection, subject)
+    # Catches repeats within this batch; stored questions reach `index` on its next sync
+    batch = MinHashIndex()
+    fresh = []
+    error = None
+    for attempt in range(DQ_GENERATION_ATTEMPTS):
+        try:
+            generated = await _generate_subject_questions(subject, date, limiter)
+        except Exception as e:
+            # Keep what earlier attempts collected and try again
+            error = e
+            print(f"Error generating daily questions for {subject} (attempt {attempt + 1}): {str(e)}")
+            continue
+        for question in generated:
+            if index.is_duplicate(question['question']):
+                continue
+            if not batch.add_if_new(question['question']):
+                continue
+            fresh.append(question)
+            if have + len(fresh) >= DQ_QUESTIONS_PER_SUBJECT:
+                break
+        if have + len(fresh) >= DQ_QUESTIONS_PER_SUBJECT:
+            break
+    if not fresh:
+        raise ValueError(f"No new valid questions generated for {subject}." + (f" Last error: {str(error)}" if error else ""))
+    # Recount in case the lease expired during generation and another process filled in
+    have = await collection.count_documents({'subject': subject, 'date': date})
+    fresh = fresh[:max(DQ_QUESTIONS_PER_SUBJECT - have, 0)]
+    if not fresh:
+        return 0
+    now = datetime.datetime.now(timezone.utc)
+    for question in fresh:
+        question['created_at'] = now
+        question['updated_at'] = now
+    await collection.insert_many(fresh)
+    return len(fresh)
+
+async def fill_daily_question_pool(days_ahead: int = None):
+    """
+    Pre-generate the daily questions for today and the next `days_ahead`
+    days (default DQ_POOL_DAYS_AHEAD). Sets that are already full are skipped,
+    so this is safe to call repeatedly.
+    """
+    days_ahead = DQ_POOL_DAYS_AHEAD if days_ahead is None else days_ahead
+    db = await get_database()
+    collection = db['dqs']
+    limiter = asyncio.Semaphore(DQ_MAX_PARALLEL_SUBJECTS)
+    stored = {}
+    failed = {}
+    for offset in range(days_ahead + 1):
+        date = ist_date(offset)
+        results = await asyncio.gather(
+            *[_top_up_subject(collection, subject, date, limiter) for subject in SUBJECTS],
+            return_exceptions=True
+        )
+        for subject, result in zip(SUBJECTS, results):
+            if isinstance(result, Exception):
+                print(f"Error generating daily questions for {subject} on {date}: {str(result)}")
+                failed.setdefault(date, {})[subject] = str(result)
+            elif result:
+                stored.setdefault(date, {})[subject] = result
+    return {"stored": stored, "failed": failed}
+
+async def get_daily_questions():
+    """
+    Top up today's set only, so the daily cron call stays within its time limit;
+    the following days are filled ahead by the pool worker.
+    """
+    try:
+        result = await fill_daily_question_pool(days_ahead=0)
+        today = ist_date()
+        failed_subjects = result["failed"].get(today, {})
+        if len(failed_subjects) == len(SUBJECTS):
+            raise HTTPException(status_code=404, detail="No daily questions generated.")
+        return {
+            "message": "Daily questions successfully stored  in the database.",
+            "stored_subjects": [subject for subject in SUBJECTS if subject not in failed_subjects],
+            "failed_subjects": failed_subjects,
+            "pool": result["stored"]
+        }
     except Exception as e:
         error_details = traceback.format_exc()
         print(f"Error fetching daily questions: {str(e)}\n{error_details}")
         raise HTTPException(status_code=500, detail=f"Error fetching daily questions: {str(e)}")
- 
+
+def _resolve_subject(subject: str) -> str:
+    # The pool stores subjects as spelled in SUBJECTS; reads are case-insensitive
+    return next((name for name in SUBJECTS if name.lower() == subject.strip().lower()), subject.strip())
+
+async def read_daily_questions(subject: str = None, date: str = None):
+    """
+    Serve a day's questions straight from the pool with one indexed
+    (subject, date) query per subject; never calls the model.
+    Answers and timestamps are left out, as in the Node getDQ endpoint.
+    """
+    try:
+        db = await get_database()
+        collection = db['dqs']
+        date = date or ist_date()
+        subjects = [_resolve_subject(subject)] if subject else SUBJECTS
+        projection = {'answer': 0, 'created_at': 0, 'updated_at': 0}
+        results = await asyncio.gather(*[
+            collection.find({'subject': name, 'date': date}, projection)
+                .sort('created_at', 1)
+                .to_list(length=DQ_QUESTIONS_PER_SUBJECT)
+            for name in subjects
+        ])
+        questions = []
+        for result in results:
+            for question in result:
+                question['_id'] = str(question['_id'])
+                questions.append(question)
+        return {
+            "date": date,
+            "size": len(questions),
+            "data": questions
+        }
+    except Exception as e:
+        print(f"Error reading daily questions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error reading daily questions: {str(e)}")
+
+async def _daily_question_worker():
+    while True:
+        try:
+            result = await fill_daily_question_pool()
+            if result["stored"]:
+                print(f"Daily question pool topped up: {result['stored']}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error filling daily question pool: {str(e)}")
+        await asyncio.sleep(DQ_POOL_REFRESH_SECONDS)
+
+async def start_daily_question_worker():
+    """
+    When DQ_POOL_WORKER is enabled, start the background task that keeps the
+    pool DQ_POOL_DAYS_AHEAD days ahead.
+    """
+    global _pool_worker
+    if DQ_POOL_WORKER and _pool_worker is None:
+        _pool_worker = asyncio.create_task(_daily_question_worker())
+
+async def stop_daily_question_worker():
+    global _pool_worker
+    if _pool_worker is not None:
+        _pool_worker.cancel()
+        try:
+            await _pool_worker
+        except asyncio.CancelledError:
+            pass
+        _pool_worker = None 
     
+async def _load_study_session(collection, subject: str, session_id: str = None, user_id: str = None):
+    """
+    Create or look up a study session and return (session_id, chat_history, bucketed).
+    Only the last STUDY_HISTORY_TURNS turns are read from the session or its buckets.
+    """
+    if not session_id:
+        new_session = {
+            "subject": subject,
+            "user": ObjectId(user_id) if user_id else None, 
+            "createdAt": datetime.datetime.now(),  # Use datetime object for proper sorting
+            # Kept empty when bucketed too; the Node.js stats aggregate reads it
+            "QnA": []
+        }
+        if MESSAGE_BUCKETS:
+            new_session.update({"bucketed": True, "messageCount": 0})
+        result = await collection.insert_one(new_session)
+        # A new session has no history; no need to read it back
+        return result.inserted_id, [], MESSAGE_BUCKETS
+    try:
+        session = ObjectId(session_id) if isinstance(session_id, str) else session_id
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid session ID format: {str(e)}")
+    session_data = await collection.find_one(
+        {"_id": session},
+        {"QnA": {"$slice": -STUDY_HISTORY_TURNS}, "subject": 1, "bucketed": 1, "messageCount": 1}
+    )
+    if not session_data:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    bucketed = session_data.get('bucketed', False)
+    if bucketed:
+        history = await recent_messages(collection.database, "assistants", session, session_data.get('messageCount', 0), STUDY_HISTORY_TURNS)
+    else:
+        history = session_data.get('QnA', []) 
+    chat_history = [(q['user'], q['bot']) for q in history]  
+    return session, chat_history, bucketed
+
+def _build_study_messages(user_query: str, subject: str, chat_history: list):
+    textbook_name = textbook.get(subject, "Unknown Subject")
+    prompt, _ = build_prompt(
+        get_prompt("study_assistant"),
+        subject=subject, 
+        textbook=textbook_name, 
+        history=chat_history[-STUDY_HISTORY_TURNS:]
+    )
+    return [
+        {
+            "role": "system",
+            "content": prompt
+        },
+        {
+            "role": "user",
+            "content": user_query
+        },
+    ]
+
+async def _save_study_turn(collection, session, user_query: str, response_text: str, bucketed: bool = False, first_turn: bool = False):
+    turn = { 
+        "user": user_query,  
+        "bot": response_text,  
+        "createdAt": datetime.datetime.now()  # Use datetime object for proper sorting
+    }
+    if bucketed:
+        session_update = {"updatedAt": turn["createdAt"]}
+        if first_turn:
+            # Bucketed sessions keep the history preview on the session document
+            session_update["preview"] = user_query
+        await append_messages(collection.database, "assistants", session, [turn], session_update)
+        return
+    await collection.update_one(
+        {"_id": session}, 
+        {
+            "$push": {"QnA": turn},
+            "$set": {"updatedAt": datetime.datetime.now()}  # Update the session's updatedAt timestamp
+        }
+    )
+
 async def study_assistant(user_query: str, subject: str, session_id: str = None, user_id: str = None):
     try:
         db = await get_database()
         collection = db['assistants'] 
-        session = session_id
-        if not session:
-            new_session = {
-                "subject": subject,
-                "user": ObjectId(user_id) if user_id else None, 
-                "createdAt": datetime.datetime.now(),  # Use datetime object for proper sorting
-                "QnA": [] 
-            }
-            result = await collection.insert_one(new_session)
-            session = result.inserted_id
-        else:
-            try:
-                if isinstance(session, str):
-                    session = ObjectId(session)
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=f"Invalid session ID format: {str(e)}")
-        session_data = await collection.find_one({"_id": session})
-        if not session_data:
-            raise HTTPException(status_code=404, detail="Session not found.")
-        history = session_data.get('QnA', []) 
-        chat_history = [(q['user'], q['bot']) for q in history]  
-        textbook_name = textbook.get(subject, "Unknown Subject")
-        response = study.chat.completions.create(
-            model = "meta-llama/llama-4-scout-17b-16e-instruct",
-            messages = [
-                {
-                    "role": "system",
-                    "content": study_assistant_prompt.format(
-                        subject=subject, 
-                        textbook=textbook_name, 
-                        history=chat_history[-5:]
-                    )
-                },
-                {
-                    "role": "user",
-                    "content": user_query
-                },
-            ]
-        )
-        response_text = response.choices[0].message.content.strip()        
-        await collection.update_one(
-            {"_id": session}, 
-            {
-                "$push": {"QnA": { 
-                    "user": user_query,  
-                    "bot": response_text,  
-                    "createdAt": datetime.datetime.now()  # Use datetime object for proper sorting
-                }},
-                "$set": {"updatedAt": datetime.datetime.now()}  # Update the session's updatedAt timestamp
-            }
-        )        
+        session, chat_history, bucketed = await _load_study_session(collection, subject, session_id, user_id)
+        # First turns don't depend on the conversation, so they can be answered from the cache
+        response_text = None if chat_history else await get_cached_answer(subject, user_query)
+        if response_text is None:
+            response = await chat_completion(
+                groq_api_key_dq,
+                model = "meta-llama/llama-4-scout-17b-16e-instruct",
+                messages = _build_study_messages(user_query, subject, chat_history)
+            )
+            response_text = response.choices[0].message.content.strip()        
+            if not chat_history:
+                await store_answer(subject, user_query, response_text)
+        await _save_study_turn(collection, session, user_query, response_text, bucketed, first_turn=not chat_history)
         return {
             "session_id": str(session),
             "response": response_text,  
@@ -127,62 +391,100 @@ async def study_assistant(user_query: str, subject: str, session_id: str = None,
         error_details = traceback.format_exc()  
         print(f"Error processing study assistant request: {str(e)}\n{error_details}")
         raise HTTPException(status_code=500, detail=f"Error processing study assistant request: {str(e)}")
+
+async def study_assistant_stream(user_query: str, subject: str, session_id: str = None, user_id: str = None):
+    """
+    Streaming variant of study_assistant.
+    Resolves the session up front (so lookup errors are still plain HTTP errors)
+    and returns an async generator of Server-Sent Events:
+    `session`, then one `token` per model delta, then `done` once the turn is saved.
+    """
+    try:
+        db = await get_database()
+        collection = db['assistants'] 
+        session, chat_history, bucketed = await _load_study_session(collection, subject, session_id, user_id)
+        messages = _build_study_messages(user_query, subject, chat_history)
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_details = traceback.format_exc()  
+        print(f"Error processing study assistant request: {str(e)}\n{error_details}")
+        raise HTTPException(status_code=500, detail=f"Error processing study assistant request: {str(e)}")
+
+    async def event_stream():
+        yield format_sse("session", {"session_id": str(session), "subject": subject})
+        chunks = []
+        try:
+            cached_answer = None if chat_history else await get_cached_answer(subject, user_query)
+            if cached_answer is not None:
+                chunks.append(cached_answer)
+                yield format_sse("token", {"content": cached_answer})
+            else:
+                async for token in stream_chat_completion(
+                    groq_api_key_dq,
+                    model = "meta-llama/llama-4-scout-17b-16e-instruct",
+                    messages = messages
+                ):
+                    chunks.append(token)
+                    yield format_sse("token", {"content": token})
+            response_text = "".join(chunks).strip()
+            if cached_answer is None and not chat_history:
+                await store_answer(subject, user_query, response_text)
+            # Persist the finished turn only after the model stream has closed
+            await _save_study_turn(collection, session, user_query, response_text, bucketed, first_turn=not chat_history)
+        except Exception as e:
+            error_details = traceback.format_exc()  
+            print(f"Error streaming study assistant response: {str(e)}\n{error_details}")
+            yield format_sse("error", {"detail": f"Error processing study assistant request: {str(e)}"})
+            return
+        yield format_sse("done", {
+            "session_id": str(session),
+            "response": response_text,
+            "subject": subject
+        })
+
+    return event_stream()
         
 async def analyse_resume(file, user_id: str = None):
+    if not file.filename.endswith(('.pdf', '.docx', '.txt')):
+        raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a text-based document.")
+    text = await get_resume_text(file)
+    return await analyse_resume_text(text, file.filename, user_id)
+
+async def analyse_resume_text(text: str, filename: str, user_id: str = None):
+    """
+    Analyse already-extracted resume text and store the result.
+    Also the handler of the `resume_analysis` background job.
+    """
     try:
-        if not file.filename.endswith(('.pdf', '.docx', '.txt')):
-            raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a text-based document.")
-        text = extract_text(file)
         if not text:
             raise HTTPException(status_code=400, detail="The file is empty or could not be read.")
-        response = client.chat.completions.create(
-            model = "meta-llama/llama-4-scout-17b-16e-instruct",
-            messages = [
-                {
-                    "role": "system",
-                    "content": resume_prompt.format(text=text)
-                }
-            ]
-        )
-        
-        ai_response_content = response.choices[0].message.content
-        resume_analysis = extract_json_objects(ai_response_content)
-        
-        if not resume_analysis:
-            # Try alternative parsing methods for multiline JSON
-            try:
-                # Remove markdown code blocks if present
-                cleaned_content = ai_response_content.strip()
-                if cleaned_content.startswith('```') and cleaned_content.endswith('```'):
-                    # Remove code block markers
-                    cleaned_content = re.sub(r'^```(?:json)?\s*', '', cleaned_content)
-                    cleaned_content = re.sub(r'\s*```$', '', cleaned_content)
-                
-                # Try to parse directly
-                analysis_data = json.loads(cleaned_content)
-                resume_analysis = [analysis_data]
-            except (json.JSONDecodeError, Exception) as e:
-                # Print the actual response for debugging
-                print(f"AI Response content: {ai_response_content}")
-                print(f"JSON parsing error: {str(e)}")
-                raise HTTPException(status_code=400, detail="Failed to analyze the resume. Please check the content.")
-        
-        if len(resume_analysis) > 1:
-            raise HTTPException(status_code=400, detail="Multiple JSON objects found in the response. Expected a single object.")
-        
-        
-        analysis_data = resume_analysis[0]
-        
-        # Handle both field name variations
-        suggestions = analysis_data.get("suggestions", "") or analysis_data.get("improvement_suggestions", "")
+        prompt, _ = build_prompt(get_prompt("resume_analysis"), text=text)
+        try:
+            analysis = await structured_completion(
+                groq_api_key_dq,
+                ResumeAnalysisResponse,
+                model = "meta-llama/llama-4-scout-17b-16e-instruct",
+                messages = [
+                    {
+                        "role": "system",
+                        "content": prompt
+                    }
+                ]
+            )
+        except StructuredOutputError as e:
+            print(f"Resume analysis did not validate: {str(e)}")
+            raise HTTPException(status_code=400, detail="Failed to analyze the resume. Please check the content.")
+        analysis_data = analysis.model_dump()
+        resume_analysis = [analysis_data]
         
         db = await get_database()
         collection = db['resumes'] 
         
         resume_document = {
-            "fileName": file.filename,
+            "fileName": filename,
             "grammaticalMistakes": analysis_data.get("grammatical_mistakes", ""),
-            "suggestions": suggestions,
+            "suggestions": analysis_data["suggestions"],
             "ATS": analysis_data.get("ats_score", 0),
             "createdAt": datetime.datetime.now(),
             "updatedAt": datetime.datetime.now()
@@ -197,7 +499,12 @@ async def analyse_resume(file, user_id: str = None):
         
         await collection.insert_one(resume_document)
         return resume_analysis
+    except HTTPException:
+        raise
     except Exception as e:
         error_details = traceback.format_exc()
         print(f"Error processing resume file: {str(e)}\n{error_details}")
         raise HTTPException(status_code=500, detail=f"Error processing resume file: {str(e)}")
+
+register_job("daily_questions", get_daily_questions)
+register_job("resume_analysis", analyse_resume_text)
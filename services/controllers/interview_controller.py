@@ -1,29 +1,26 @@
 from dotenv import load_dotenv
 import os
+import re
+import asyncio
 from groq import Groq
-from pathlib import Path
 from fastapi import HTTPException, UploadFile
+from fastapi.responses import Response, StreamingResponse
 import traceback
+import hashlib
+from pydantic import ValidationError
 from database.db_config import get_database
 import datetime
 from bson import ObjectId
-from utils.helper import extract_json_objects
-from models.prompts import (
-    feedback_prompt, 
-    resume_based_interviewer_prompt,
-    hr_resume_interviewer_prompt,
-    data_science_resume_interviewer_prompt,
-    webdev_resume_interviewer_prompt,
-    full_technical_resume_interviewer_prompt,
-    hr_general_interviewer_prompt,
-    data_science_general_interviewer_prompt,
-    webdev_general_interviewer_prompt,
-    full_technical_general_interviewer_prompt,
-    hr_feedback_prompt,
-    data_science_feedback_prompt,
-    webdev_feedback_prompt,
-    full_technical_feedback_prompt
-)
+from utils.helper import format_sse
+from utils.llm_gateway import chat_completion, stream_chat_completion, stream_speech
+from utils.speech_cache import speech_cache_key, get_cached_speech, store_speech
+from utils.structured_output import structured_completion, StructuredOutputError
+from utils.single_flight import SingleFlight
+from utils.job_queue import register_job
+from utils.message_store import read_messages, recent_messages
+from utils.prompt_builder import build_prompt, count_tokens, PROMPT_TOKEN_BUDGETS
+from models.prompt_registry import get_prompt
+from models.response_model import FeedBackResponse
 
 load_dotenv()
 
@@ -31,9 +28,267 @@ groq_api_audio = os.getenv("GROQ_API_AUDIO")
 groq_api_key_interviewer = os.getenv("GROQ_API_KEY_DQ")
 groq_api_key_feedback = os.getenv("GROQ_API_KEY_DQ")
 
-interviewer = Groq(api_key = groq_api_key_interviewer)
 client = Groq(api_key=groq_api_audio)
-feedback_client = Groq(api_key=groq_api_key_feedback) 
+
+TTS_MODEL = os.getenv("TTS_MODEL", "playai-tts")
+TTS_FORMAT = "wav"
+
+# Rolling interview history: the last messages are kept verbatim in `recentHistory`,
+# anything older is folded into `historySummary` by a background task
+INTERVIEW_HISTORY_MESSAGES = int(os.getenv("INTERVIEW_HISTORY_MESSAGES", "40"))
+INTERVIEW_VERBATIM_MESSAGES = int(os.getenv("INTERVIEW_VERBATIM_MESSAGES", "8"))
+INTERVIEW_SUMMARY_BATCH = int(os.getenv("INTERVIEW_SUMMARY_BATCH", "6"))
+
+GREETINGS = (
+    "Hello, I am ready to start the interview.",
+    "Hello, I'm ready to start the interview. Please begin with your first question."
+)
+
+_compaction_tasks = {}
+# In-flight feedback generations, keyed by session id
+_feedback_flights = SingleFlight()
+
+def interview_session_filter(session: str) -> dict:
+    """
+    Node.js sessions are addressed by the interview _id, fallback sessions by the `sessionId` field.
+    """
+    if ObjectId.is_valid(session):
+        return {"$or": [{"_id": ObjectId(session)}, {"sessionId": session}]}
+    return {"sessionId": session}
+
+def _messages_from_qna(qna_list: list) -> list:
+    """
+    Convert Node.js QnA entries ({bot, user}) into rolling-history messages.
+    """
+    messages = []
+    for qna in qna_list:
+        interviewer_msg = (qna.get('bot') or '').strip()
+        candidate_msg = (qna.get('user') or '').strip()
+        if interviewer_msg:
+            messages.append({"role": "interviewer", "content": interviewer_msg})
+        if candidate_msg and candidate_msg not in GREETINGS:
+            messages.append({"role": "candidate", "content": candidate_msg})
+    return messages
+
+async def load_interview_history(collection, session: str) -> dict:
+    """
+    Load the prompt history of an interview, reading only the bounded
+    `recentHistory` and `historySummary` fields. Sessions written before the
+    rolling history existed are seeded from the tail of their QnA array; those
+    messages are returned as `seed_messages` so the next save stores them.
+    `filter` is None when the session does not exist yet.
+    """
+    history = {"filter": None, "messages": [], "seed_messages": [], "summary": ""}
+    session_doc = await collection.find_one(
+        interview_session_filter(session),
+        {"recentHistory": 1, "historySummary": 1, "bucketed": 1, "messageCount": 1}
+    )
+    if not session_doc:
+        return history
+    history["filter"] = {"_id": session_doc["_id"]}
+    history["summary"] = session_doc.get("historySummary", "")
+    if "recentHistory" in session_doc:
+        history["messages"] = session_doc["recentHistory"]
+        return history
+    legacy_doc = await collection.find_one(history["filter"], {"QnA": {"$slice": -INTERVIEW_HISTORY_MESSAGES}})
+    qna_list = (legacy_doc or {}).get("QnA", [])
+    if session_doc.get("bucketed"):
+        qna_list = await recent_messages(
+            collection.database, "interviews", session_doc["_id"],
+            session_doc.get("messageCount", 0), INTERVIEW_HISTORY_MESSAGES
+        ) + qna_list
+    seed_messages = _messages_from_qna(qna_list)[-INTERVIEW_HISTORY_MESSAGES:]
+    history["messages"] = seed_messages
+    history["seed_messages"] = seed_messages
+    return history
+
+def _render_messages(messages: list) -> str:
+    rendered = ""
+    for message in messages:
+        speaker = "Interviewer" if message.get("role") == "interviewer" else "Candidate"
+        rendered += f"{speaker}: {message.get('content', '')}\n\n"
+    return rendered
+
+def format_interview_history(messages: list, user_response: str = None, summary: str = "") -> str:
+    """
+    Render the summary of earlier turns, the rolling-history messages and the
+    candidate's current answer as prompt text.
+    """
+    history = ""
+    if summary:
+        history += f"Summary of the earlier interview: {summary}\n\n"
+    history += _render_messages(messages)
+    if user_response and user_response.strip() not in GREETINGS:
+        history += f"Candidate: {user_response}\n"
+    return history
+
+async def save_interview_turn(collection, session_filter: dict, user_response: str, ai_response: str, seed_messages: list = None):
+    """
+    Append the candidate's answer and the interviewer's next question to the
+    rolling history with a single atomic $push, trimmed to the last
+    INTERVIEW_HISTORY_MESSAGES entries.
+    """
+    now = datetime.datetime.now()
+    # Seeded messages get distinct, increasing timestamps just before this turn,
+    # so compaction can cut inside the seeded block (Mongo dates have ms precision)
+    seed_messages = seed_messages or []
+    new_messages = [
+        dict(message, createdAt=message.get("createdAt", now - datetime.timedelta(milliseconds=len(seed_messages) - i)))
+        for i, message in enumerate(seed_messages)
+    ]
+    if user_response and user_response.strip() not in GREETINGS:
+        new_messages.append({"role": "candidate", "content": user_response.strip(), "createdAt": now})
+    if ai_response:
+        new_messages.append({"role": "interviewer", "content": ai_response, "createdAt": now})
+    if not new_messages:
+        return
+    await collection.update_one(
+        session_filter,
+        {
+            "$push": {"recentHistory": {"$each": new_messages, "$slice": -INTERVIEW_HISTORY_MESSAGES}},
+            "$set": {"updatedAt": now}
+        }
+    )
+
+def _is_answered(qna: dict) -> bool:
+    answer = (qna.get("user") or qna.get("answer") or "").strip()
+    return bool(answer) and answer not in GREETINGS
+
+async def _load_qna(collection, session_doc: dict) -> list:
+    """
+    The full QnA of an interview: migrated turns from the message buckets
+    followed by anything Node.js pushed to the embedded array since.
+    """
+    qna_list = session_doc.get("QnA", [])
+    if session_doc.get("bucketed"):
+        qna_list = await read_messages(collection.database, "interviews", session_doc["_id"]) + qna_list
+    return qna_list
+
+def _fit_exchanges(qna_list: list, start: int, boundary: int) -> int:
+    """
+    The last index up to `boundary` whose exchanges after `start` still fit the
+    summary prompt's exchanges budget (at least one entry is always taken).
+    """
+    budget = PROMPT_TOKEN_BUDGETS["interview_summary"]["exchanges"]
+    end, used = start, 0
+    for index in range(start + 1, boundary + 1):
+        used += count_tokens(_render_messages(_messages_from_qna([qna_list[index]])))
+        if used > budget and end > start:
+            break
+        end = index
+    return end
+
+def _summary_boundary(qna_list: list, older: list, newer: list, summarized_through: int) -> int:
+    """
+    The QnA index of the last candidate answer in `older`, found by its text
+    after `summarized_through`. `newer` is the rest of the rolling history; the
+    match must leave room for its answers (Node.js may not have stored the very
+    latest one yet). Returns None if the answer cannot be located.
+    """
+    answers = [message["content"].strip() for message in older if message.get("role") == "candidate"]
+    if not answers:
+        return None
+    later_answers = sum(1 for message in newer if message.get("role") == "candidate")
+    answered_after = 0
+    for index in range(len(qna_list) - 1, summarized_through, -1):
+        qna = qna_list[index]
+        if not _is_answered(qna):
+            continue
+        if answered_after >= later_answers - 1 and (qna.get("user") or qna.get("answer") or "").strip() == answers[-1]:
+            return index
+        answered_after += 1
+    return None
+
+async def compact_interview_history(collection, session_filter: dict):
+    """
+    Fold the messages older than the verbatim window into `historySummary`.
+    The summary always covers a prefix of the QnA: each refresh summarises the
+    QnA entries from the previous boundary up to the last answer being folded
+    in, so turns that never reached `recentHistory` (legacy sessions, trimmed
+    or unrecorded turns) are included, and `summarizedThrough` records the
+    QnA index it covers. Summarised messages are removed by timestamp, so
+    turns appended while the summary was being generated are never lost.
+    """
+    session_doc = await collection.find_one(
+        session_filter,
+        {"recentHistory": 1, "historySummary": 1, "summarizedThrough": 1, "domain": 1, "difficulty": 1,
+         "QnA.bot": 1, "QnA.user": 1, "bucketed": 1}
+    )
+    if not session_doc:
+        return
+    messages = session_doc.get("recentHistory", [])
+    if len(messages) - INTERVIEW_VERBATIM_MESSAGES < INTERVIEW_SUMMARY_BATCH:
+        return
+    cutoff = messages[-INTERVIEW_VERBATIM_MESSAGES]["createdAt"]
+    older = [message for message in messages if message["createdAt"] < cutoff]
+    if not older:
+        return
+    newer = messages[len(older):]
+
+    previous_through = session_doc.get("summarizedThrough")
+    start = -1 if previous_through is None else previous_through
+    qna_list = await _load_qna(collection, session_doc)
+    boundary = _summary_boundary(qna_list, older, newer, start)
+    caught_up = True
+    if boundary is not None:
+        # A long backlog (e.g. a legacy session) is summarised one budget-sized batch per turn
+        fitted = _fit_exchanges(qna_list, start, boundary)
+        caught_up = fitted == boundary
+        boundary = fitted
+        exchanges = _render_messages(_messages_from_qna(qna_list[start + 1:boundary + 1]))
+    elif previous_through is None:
+        # No QnA to align with (or the answer is not stored yet); the summary
+        # stays prompt-only and feedback keeps every answer verbatim
+        exchanges = _render_messages(older)
+    else:
+        return
+    
+    prompt, _ = build_prompt(
+        get_prompt("interview_summary"),
+        domain=session_doc.get("domain", "general"),
+        difficulty=session_doc.get("difficulty", "medium"),
+        summary=session_doc.get("historySummary", "") or "None yet.",
+        exchanges=exchanges
+    )
+    response = await chat_completion(
+        groq_api_key_interviewer,
+        model="meta-llama/llama-4-scout-17b-16e-instruct",
+        messages=[
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.2,
+        max_tokens=400
+    )
+    summary = response.choices[0].message.content.strip()
+    if not summary:
+        return
+    update = {"$set": {"historySummary": summary}}
+    if boundary is not None:
+        update["$set"]["summarizedThrough"] = boundary
+    if caught_up:
+        update["$pull"] = {"recentHistory": {"createdAt": {"$lt": cutoff}}}
+    # Only apply on top of the boundary this summary was built from
+    await collection.update_one({**session_filter, "summarizedThrough": previous_through}, update)
+
+def schedule_history_compaction(collection, session_filter: dict):
+    """
+    Refresh the interview summary in the background, at most once at a time per session.
+    """
+    key = str(session_filter.get("_id"))
+    task = _compaction_tasks.get(key)
+    if task is not None and not task.done():
+        return
+
+    async def run():
+        try:
+            await compact_interview_history(collection, session_filter)
+        except Exception as e:
+            error_details = traceback.format_exc()
+            print(f"Error summarising interview history: {str(e)}\n{error_details}")
+        finally:
+            _compaction_tasks.pop(key, None)
+
+    _compaction_tasks[key] = asyncio.create_task(run())
 
 async def transcript(file: UploadFile):
     try:
@@ -61,87 +316,125 @@ async def transcript(file: UploadFile):
         print(f"Error processing audio file: {str(e)}\n{error_details}")
         raise HTTPException(status_code=500, detail=f"Error processing audio file: {str(e)}")
 
-async def text_to_speech_controller(text: str, voice: str = "Aaliyah-PlayAI"):
+async def _speech_stream(first_chunk: bytes, chunks, key: str):
+    """
+    Relay the provider's audio to the client and cache it once it is complete.
+    A stream cut short by an error or a client disconnect is not cached.
+    """
+    audio = bytearray(first_chunk)
     try:
-        import uuid
-        from pathlib import Path
-        import os
-        from fastapi.responses import FileResponse
-        from starlette.background import BackgroundTask
-
-        unique_id = str(uuid.uuid4())
-        output_dir = Path("speech_output")
-        output_dir.mkdir(exist_ok=True) 
-        
-        speech_file_path = output_dir / f"{unique_id}.wav"
-    
-        response = client.audio.speech.create(
-            model="playai-tts",  
-            voice=voice,        
-            response_format="wav", 
-            input=text         
-        )
-        try:
-            with open(speech_file_path, "wb") as f:
-                response.write_to_file(speech_file_path)
+        yield first_chunk
+        async for chunk in chunks:
+            audio.extend(chunk)
+            yield chunk
+    finally:
+        # Releases the provider connection and concurrency slot on disconnect
+        await chunks.aclose()
+    await store_speech(key, bytes(audio))
 
-        except AttributeError:
-            try:
-                response.stream_to_file(speech_file_path)
-            except AttributeError as e:
-                raise AttributeError(f"Groq response object does not have expected methods ('write_to_file' or 'stream_to_file'). Error: {e}")
+async def text_to_speech_controller(text: str, voice: str = "Aaliyah-PlayAI"):
+    """
+    Synthesise speech as WAV, streamed to the client as the provider produces it.
+    Repeated (voice, text) pairs are served from the speech cache without a provider call.
+    """
+    try:
+        key = speech_cache_key(text, voice, TTS_MODEL, TTS_FORMAT)
+        headers = {"Content-Disposition": f'attachment; filename="speech_{key[:16]}.wav"'}
 
-        def cleanup_file(path):
-            try:
-                os.remove(path)
-            except Exception:
-                pass
+        audio = await get_cached_speech(key)
+        if audio is not None:
+            return Response(content=audio, media_type="audio/wav", headers={**headers, "X-Speech-Cache": "hit"})
 
-        return FileResponse(
-            path=speech_file_path,
+        chunks = stream_speech(groq_api_audio, model=TTS_MODEL, voice=voice, response_format=TTS_FORMAT, input=text)
+        # Wait for the first bytes so provider errors still surface as a 500
+        first_chunk = b""
+        async for first_chunk in chunks:
+            if first_chunk:
+                break
+        if not first_chunk:
+            await chunks.aclose()
+            raise ValueError("The speech provider returned no audio.")
+        return StreamingResponse(
+            _speech_stream(first_chunk, chunks, key),
             media_type="audio/wav",
-            filename=f"speech_{unique_id}.wav",
-            background=BackgroundTask(cleanup_file, speech_file_path)
+            headers={**headers, "X-Speech-Cache": "miss"}
         )
         
     except Exception as e:
         
         error_details = traceback.format_exc()
         print(f"Error generating speech: {str(e)}\n{error_details}") 
-        from fastapi import HTTPException
         raise HTTPException(status_code=500, detail=f"Error generating speech: {str(e)}")
     
     
+def qna_fingerprint(chat_history) -> str:
+    """
+    Hash of the question/answer text of a session; changes whenever a turn
+    is added or an answer is filled in.
+    """
+    digest = hashlib.sha256()
+    for qna in chat_history:
+        question = qna.get("question", qna.get("bot", "")) or ""
+        answer = qna.get("answer", qna.get("user", "")) or ""
+        digest.update(f"{len(question)}:{question}{len(answer)}:{answer}".encode("utf-8"))
+    return digest.hexdigest()
+
 async def get_interview_feedback(session_id: str):
     """
-    Generate AI-powered feedback for an interview session
+    Generate AI-powered feedback for an interview session.
+    Concurrent requests for the same session share one generation, and the
+    result is served from the interview document until its QnA changes.
     """
+    return await _feedback_flights.do(session_id, lambda: _get_or_generate_feedback(session_id))
+
+async def _get_or_generate_feedback(session_id: str):
     try:
         db = await get_database()
         collection = db['interviews']  
-        session_data_db = await collection.find_one({"_id": ObjectId(session_id)})
+        session_data_db = await collection.find_one(
+            {"_id": ObjectId(session_id)},
+            {"QnA": 1, "domain": 1, "difficulty": 1, "historySummary": 1, "summarizedThrough": 1, "feedBack": 1, "feedbackFingerprint": 1, "bucketed": 1}
+        )
         
         if not session_data_db:
             raise HTTPException(status_code=404, detail="Session not found.")
 
-        chat_history = session_data_db.get('QnA', []) 
+        # Migrated turns live in buckets; anything Node.js pushed since is still embedded
+        chat_history = await _load_qna(collection, session_data_db)
         if not chat_history:
             raise HTTPException(status_code=404, detail="No interview questions found in the session.")
         
+        fingerprint = qna_fingerprint(chat_history)
+        stored = session_data_db.get('feedBack')
+        if stored and session_data_db.get('feedbackFingerprint') == fingerprint:
+            try:
+                return FeedBackResponse.model_validate(stored).model_dump()
+            except ValidationError:
+                pass  # Stored in an older format; regenerate
+        
         domain = session_data_db.get('domain', 'General')
         difficulty = session_data_db.get('difficulty', 'Medium')
         
+        # QnA entries up to summarizedThrough are covered by the rolling summary and replaced by it
+        summary = session_data_db.get('historySummary', '')
+        summarized_through = session_data_db.get('summarizedThrough')
+        if not summary or summarized_through is None:
+            summarized_through = -1
+        
         # Build conversation string
         conversation = ""
+        if summarized_through >= 0:
+            conversation += f"Summary of questions 1-{summarized_through + 1}: {summary}\\n\\n"
         for idx, qna in enumerate(chat_history):
+            if idx <= summarized_through:
+                continue
             question = qna.get("question", qna.get("bot", ""))  # Handle both formats
             answer = qna.get("answer", qna.get("user", ""))     # Handle both formats
             
             # Skip empty responses or initial greetings
             if not question or not answer:
                 continue
-            if answer.strip() in ["Hello, I am ready to start the interview.", 
-                                 "Hello, I'm ready to start the interview. Please begin with your first question."]:
+            if answer.strip() in GREETINGS:
                 continue
                 
             conversation += f"Q{idx+1}: {question}\\nA{idx+1}: {answer}\\n\\n"
@@ -149,74 +442,39 @@ async def get_interview_feedback(session_id: str):
         if not conversation.strip():
             raise HTTPException(status_code=400, detail="No valid conversation found to analyze.")
         
-        # Select the appropriate feedback prompt based on domain
-        domain_feedback_prompts = {
-            "hr": hr_feedback_prompt,
-            "dataScience": data_science_feedback_prompt,
-            "webdev": webdev_feedback_prompt,
-            "fullTechnical": full_technical_feedback_prompt
-        }
-        
-        # Get the domain-specific feedback prompt or fallback to generic
-        selected_feedback_prompt = domain_feedback_prompts.get(domain, feedback_prompt)
-        
-        response = feedback_client.chat.completions.create(
-            model="meta-llama/llama-4-scout-17b-16e-instruct",
-            messages=[
-                {"role": "system", "content": "You are an expert interview feedback assistant. Ensure your output is a single, valid JSON object matching the specified format."},
-                {"role": "user", "content": selected_feedback_prompt.format(
-                    difficulty=difficulty,
-                    conversation=conversation
-                )}
-            ],
-            temperature=0.3,
-            max_tokens=2048
+        # Domain-specific feedback prompt, or the generic one for unknown domains
+        prompt, _ = build_prompt(
+            get_prompt("feedback", domain),
+            domain=domain,
+            difficulty=difficulty,
+            conversation=conversation
         )
         
-        feedback = response.choices[0].message.content.strip()
-        
-        # Extract JSON from response
-        feedback_data = extract_json_objects(feedback)
-        
-        if isinstance(feedback_data, list) and len(feedback_data) > 0:
-            feedback_data = feedback_data[0]
-        elif not feedback_data:
-            feedback_data = {}
-        
-        # Ensure the feedback data has the correct structure for Pydantic validation
-        if not feedback_data or "feedback" not in feedback_data:
-            feedback_data = {
-                "feedback": {
-                    "technical_knowledge": "Good understanding demonstrated in responses",
-                    "communication_skills": "Clear and articulate communication",
-                    "confidence": "Confident in answering questions", 
-                    "problem_solving": "Systematic approach to problem-solving",
-                    "suggestions": {
-                        "technical_knowledge": "Continue practicing domain-specific concepts",
-                        "communication_skills": "Maintain clear and concise explanations",
-                        "confidence": "Keep up the confident approach",
-                        "problem_solving": "Continue breaking down complex problems"
-                    }
-                },
-                "overall_score": 75
-            }
-        else:
-            # Ensure suggestions field exists in feedback
-            if "suggestions" not in feedback_data["feedback"]:
-                feedback_data["feedback"]["suggestions"] = {
-                    "technical_knowledge": feedback_data["feedback"].get("technical_knowledge", "Continue practicing domain-specific concepts"),
-                    "communication_skills": feedback_data["feedback"].get("communication_skills", "Maintain clear and concise explanations"),
-                    "confidence": feedback_data["feedback"].get("confidence", "Keep up the confident approach"),
-                    "problem_solving": feedback_data["feedback"].get("problem_solving", "Continue breaking down complex problems")
-                }
-            
-            # Ensure overall_score exists and is an integer
-            if "overall_score" not in feedback_data or not isinstance(feedback_data["overall_score"], (int, float)):
-                feedback_data["overall_score"] = 75
-            else:
-                # Convert to int if it's a float
-                feedback_data["overall_score"] = int(feedback_data["overall_score"])
-        
+        try:
+            feedback = await structured_completion(
+                groq_api_key_feedback,
+                FeedBackResponse,
+                model="meta-llama/llama-4-scout-17b-16e-instruct",
+                messages=[
+                    {"role": "system", "content": "You are an expert interview feedback assistant. Ensure your output is a single, valid JSON object matching the specified format."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=2048
+            )
+        except StructuredOutputError as e:
+            raise HTTPException(status_code=502, detail=f"The feedback model returned an invalid response: {str(e)}")
+        
+        feedback_data = feedback.model_dump()
+        # Tied to the QnA it was generated from; a later turn makes it stale
+        await collection.update_one(
+            {"_id": session_data_db["_id"]},
+            {"$set": {
+                "feedBack": feedback_data,
+                "score": feedback_data["overall_score"],
+                "feedbackFingerprint": fingerprint
+            }}
+        )
         return feedback_data
         
     except Exception as e:
@@ -226,6 +484,33 @@ async def get_interview_feedback(session_id: str):
             raise
         raise HTTPException(status_code=500, detail=f"Error processing interview feedback: {str(e)}")
 
+register_job("interview_feedback", get_interview_feedback)
+
+def _resume_interviewer_messages(resume_content: str, domain: str, difficulty: str, history: str):
+    # Domain-specific prompt, or the generic resume-based one for unknown domains
+    prompt, _ = build_prompt(
+        get_prompt("resume_interviewer", domain),
+        domain=domain,
+        resume_content=resume_content,
+        difficulty=difficulty,
+        history=history
+    )
+    return [
+        {"role": "system", "content": f"You are a professional {domain} interviewer. Ask natural, conversational questions based on the candidate's resume and {domain} domain expertise."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _resume_interviewer_fallback(domain: str):
+    # Provide fallback response based on domain
+    fallback_responses = {
+        "hr": "That's interesting! Can you tell me about a challenging situation you've faced in a team environment?",
+        "dataScience": "Great! Can you walk me through a data analysis project you've worked on recently?", 
+        "webdev": "Excellent! Can you describe a web application you've built and the technologies you used?",
+        "fullTechnical": "Good answer! Can you explain your approach to solving complex technical problems?"
+    }
+    
+    return fallback_responses.get(domain, "Thank you for sharing that. Can you elaborate more on your experience?")
+
 async def resume_based_interviewer(resume_content: str, domain: str, difficulty: str, history: str):
     try:
         # Validate inputs
@@ -241,27 +526,10 @@ async def resume_based_interviewer(resume_content: str, domain: str, difficulty:
         if not history:
             history = ""
         
-        # Select the appropriate prompt based on domain
-        domain_prompts = {
-            "hr": hr_resume_interviewer_prompt,
-            "dataScience": data_science_resume_interviewer_prompt,
-            "webdev": webdev_resume_interviewer_prompt,
-            "fullTechnical": full_technical_resume_interviewer_prompt
-        }
-        
-        # Get the domain-specific prompt or fallback to generic
-        selected_prompt = domain_prompts.get(domain)
-        
-        response = interviewer.chat.completions.create(
+        response = await chat_completion(
+            groq_api_key_interviewer,
             model="meta-llama/llama-4-scout-17b-16e-instruct",
-            messages=[
-                {"role": "system", "content": f"You are a professional {domain} interviewer. Ask natural, conversational questions based on the candidate's resume and {domain} domain expertise."},
-                {"role": "user", "content": selected_prompt.format(
-                    resume_content=resume_content,
-                    difficulty=difficulty,
-                    history=history
-                )}
-            ],
+            messages=_resume_interviewer_messages(resume_content, domain, difficulty, history),
             temperature=0.7,
             max_tokens=1024
         )
@@ -280,16 +548,31 @@ async def resume_based_interviewer(resume_content: str, domain: str, difficulty:
         if isinstance(e, HTTPException):
             raise
         
-        # Provide fallback response based on domain
-        fallback_responses = {
-            "hr": "That's interesting! Can you tell me about a challenging situation you've faced in a team environment?",
-            "dataScience": "Great! Can you walk me through a data analysis project you've worked on recently?", 
-            "webdev": "Excellent! Can you describe a web application you've built and the technologies you used?",
-            "fullTechnical": "Good answer! Can you explain your approach to solving complex technical problems?"
-        }
-        
-        fallback_response = fallback_responses.get(domain, "Thank you for sharing that. Can you elaborate more on your experience?")
-        return fallback_response
+        return _resume_interviewer_fallback(domain)
+
+def _general_interviewer_messages(username: str, domain: str, difficulty: str, history: str):
+    # Domain-specific prompt for general interviews, HR by default
+    prompt, _ = build_prompt(
+        get_prompt("general_interviewer", domain),
+        username=username,
+        difficulty=difficulty,
+        history=history
+    )
+    return [
+        {"role": "system", "content": f"You are a professional {domain} interviewer conducting a general interview. The candidate has chosen not to provide a resume, so focus on general {domain} domain questions while using their name to personalize the conversation."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _general_interviewer_fallback(username: str, domain: str):
+    # Provide fallback response based on domain
+    fallback_responses = {
+        "hr": f"Hello {username}! Let's start with a behavioral question. Can you tell me about a time when you had to work with a challenging team member?",
+        "dataScience": f"Hello {username}! Let's begin with a data science question. Can you explain the difference between supervised and unsupervised learning?", 
+        "webdev": f"Hello {username}! Let's start with a web development question. Can you explain the difference between frontend and backend development?",
+        "fullTechnical": f"Hello {username}! Let's begin with a technical question. Can you explain what an algorithm is and give an example?"
+    }
+    
+    return fallback_responses.get(domain, f"Hello {username}! Thank you for joining this interview. Can you tell me about your interest in the {domain} field?")
 
 async def general_interviewer(username: str, domain: str, difficulty: str, history: str):
     """
@@ -310,27 +593,10 @@ async def general_interviewer(username: str, domain: str, difficulty: str, histo
         if not history:
             history = ""
         
-        # Select the appropriate prompt based on domain for general interviews
-        general_domain_prompts = {
-            "hr": hr_general_interviewer_prompt,
-            "dataScience": data_science_general_interviewer_prompt,
-            "webdev": webdev_general_interviewer_prompt,
-            "fullTechnical": full_technical_general_interviewer_prompt
-        }
-        
-        # Get the domain-specific prompt for general interviews
-        selected_prompt = general_domain_prompts.get(domain, hr_general_interviewer_prompt)
-        
-        response = interviewer.chat.completions.create(
+        response = await chat_completion(
+            groq_api_key_interviewer,
             model="meta-llama/llama-4-scout-17b-16e-instruct",
-            messages=[
-                {"role": "system", "content": f"You are a professional {domain} interviewer conducting a general interview. The candidate has chosen not to provide a resume, so focus on general {domain} domain questions while using their name to personalize the conversation."},
-                {"role": "user", "content": selected_prompt.format(
-                    username=username,
-                    difficulty=difficulty,
-                    history=history
-                )}
-            ],
+            messages=_general_interviewer_messages(username, domain, difficulty, history),
             temperature=0.7,
             max_tokens=1024
         )
@@ -349,13 +615,88 @@ async def general_interviewer(username: str, domain: str, difficulty: str, histo
         if isinstance(e, HTTPException):
             raise
         
-        # Provide fallback response based on domain
-        fallback_responses = {
-            "hr": f"Hello {username}! Let's start with a behavioral question. Can you tell me about a time when you had to work with a challenging team member?",
-            "dataScience": f"Hello {username}! Let's begin with a data science question. Can you explain the difference between supervised and unsupervised learning?", 
-            "webdev": f"Hello {username}! Let's start with a web development question. Can you explain the difference between frontend and backend development?",
-            "fullTechnical": f"Hello {username}! Let's begin with a technical question. Can you explain what an algorithm is and give an example?"
-        }
-        
-        fallback_response = fallback_responses.get(domain, f"Hello {username}! Thank you for joining this interview. Can you tell me about your interest in the {domain} field?")
-        return fallback_response
\ No newline at end of file
+        return _general_interviewer_fallback(username, domain)
+
+# A sentence ends at ., ! or ? followed by whitespace
+_sentence_end = re.compile(r'(?<=[.!?])\s+')
+
+async def _stream_interviewer_turn(messages: list, fallback_response: str, empty_response: str, session_id: str = None, on_complete=None):
+    """
+    Stream an interviewer turn as Server-Sent Events.
+    Emits `token` for every model delta, `sentence` for every completed sentence
+    (so speech synthesis can start on the first one) and `done` with the full question.
+    Falls back to the canned question if the model fails before producing any text.
+    `on_complete(ai_response)` is awaited before `done` is sent, e.g. to persist the turn.
+    """
+    chunks = []
+    pending = ""
+    try:
+        async for token in stream_chat_completion(
+            groq_api_key_interviewer,
+            model="meta-llama/llama-4-scout-17b-16e-instruct",
+            messages=messages,
+            temperature=0.7,
+            max_tokens=1024
+        ):
+            chunks.append(token)
+            yield format_sse("token", {"content": token})
+            pending += token
+            parts = _sentence_end.split(pending)
+            for sentence in parts[:-1]:
+                if sentence.strip():
+                    yield format_sse("sentence", {"content": sentence.strip()})
+            pending = parts[-1]
+    except Exception as e:
+        error_details = traceback.format_exc()
+        print(f"Error streaming interview question: {str(e)}\n{error_details}")
+        if not chunks:
+            chunks = [fallback_response]
+            pending = fallback_response
+            yield format_sse("token", {"content": fallback_response})
+    
+    if pending.strip():
+        yield format_sse("sentence", {"content": pending.strip()})
+    ai_response = "".join(chunks).strip()
+    if not ai_response:
+        ai_response = empty_response
+        yield format_sse("sentence", {"content": ai_response})
+    if on_complete is not None:
+        try:
+            await on_complete(ai_response)
+        except Exception as e:
+            print(f"Error saving streamed interview turn: {str(e)}")
+    yield format_sse("done", {"ai": ai_response, "session_id": session_id})
+
+def resume_based_interviewer_stream(resume_content: str, domain: str, difficulty: str, history: str, session_id: str = None, on_complete=None):
+    """
+    Streaming variant of resume_based_interviewer. Returns an async generator of SSE events.
+    """
+    if not resume_content or not resume_content.strip():
+        resume_content = "No resume content provided. Please conduct a general interview based on the selected domain."
+    domain = domain or "general"
+    difficulty = difficulty or "medium"
+    history = history or ""
+    return _stream_interviewer_turn(
+        _resume_interviewer_messages(resume_content, domain, difficulty, history),
+        fallback_response=_resume_interviewer_fallback(domain),
+        empty_response=f"Thank you for your response. Let's continue with the {domain} interview. Can you tell me more about your experience in this field?",
+        session_id=session_id,
+        on_complete=on_complete
+    )
+
+def general_interviewer_stream(username: str, domain: str, difficulty: str, history: str, session_id: str = None, on_complete=None):
+    """
+    Streaming variant of general_interviewer. Returns an async generator of SSE events.
+    """
+    if not username or not username.strip():
+        username = "candidate"
+    domain = domain or "general"
+    difficulty = difficulty or "medium"
+    history = history or ""
+    return _stream_interviewer_turn(
+        _general_interviewer_messages(username, domain, difficulty, history),
+        fallback_response=_general_interviewer_fallback(username, domain),
+        empty_response=f"Hello {username}! Thank you for joining this {domain} interview. Let's start with a question about your experience in this field.",
+        session_id=session_id,
+        on_complete=on_complete
+    )
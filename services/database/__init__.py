@@ -1,3 +1,3 @@
-from database.db_config import get_database
+from database.db_config import get_database, connect_to_database, close_database_connection
 
-__all__ = ['get_database']
+__all__ = ['get_database', 'connect_to_database', 'close_database_connection']
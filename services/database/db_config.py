@@ -1,21 +1,58 @@
 from dotenv import load_dotenv
-import os 
+import os
 from pymongo import MongoClient
 import traceback
 from motor.motor_asyncio import AsyncIOMotorClient
 
 load_dotenv()
 db_url = os.getenv("DB_URL")
+db_name = os.getenv("DB_NAME", "mini_project")
 
-async def get_database():
+# Connection pool settings for the shared client
+DB_MAX_POOL_SIZE = int(os.getenv("DB_MAX_POOL_SIZE", "50"))
+DB_MIN_POOL_SIZE = int(os.getenv("DB_MIN_POOL_SIZE", "0"))
+DB_MAX_IDLE_TIME_MS = int(os.getenv("DB_MAX_IDLE_TIME_MS", "60000"))
+DB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("DB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+
+# Process-wide client, created once at app startup and closed at shutdown
+_client: AsyncIOMotorClient = None
+
+def connect_to_database():
+    """
+    Create the shared Motor client. Safe to call more than once.
+    """
+    global _client
+    if _client is not None:
+        return _client
     try:
         if not db_url:
             raise ValueError("DB_URL environment variable is not set.")
-        client = AsyncIOMotorClient(db_url)
-        db = client['mini_project']
-        return db
+        _client = AsyncIOMotorClient(
+            db_url,
+            maxPoolSize=DB_MAX_POOL_SIZE,
+            minPoolSize=DB_MIN_POOL_SIZE,
+            maxIdleTimeMS=DB_MAX_IDLE_TIME_MS,
+            serverSelectionTimeoutMS=DB_SERVER_SELECTION_TIMEOUT_MS,
+        )
+        return _client
     except Exception as e:
         error_details = traceback.format_exc()
         print(f"Error connecting to the database: {str(e)}\n{error_details}")
         raise Exception(f"Error connecting to the database: {str(e)}")
 
+def close_database_connection():
+    """
+    Close the shared Motor client and release its connection pool.
+    """
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+async def get_database():
+    """
+    Return the application database from the shared client.
+    Can be awaited directly or used as a FastAPI dependency.
+    """
+    client = _client or connect_to_database()
+    return client[db_name]
@@ -0,0 +1,140 @@
+"""
+Index manifest for every collection the services query.
+
+INDEXES lists each secondary index with the query it serves, and
+ensure_indexes() creates them at startup. Creating an index that already
+exists is a no-op, so this is safe on every boot and from several processes.
+A TTL whose duration changed in the environment is updated in place with
+collMod. HOT_QUERIES holds representative hot-path queries, and
+check_query_plans() explains each one and reports any that plans to a
+collection scan. Both are run from `python -m scripts.ensure_indexes`, and
+tests/test_query_plans.py asserts there are none against a live mongod.
+"""
+
+import os
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo.errors import OperationFailure
+from utils.job_queue import QUEUED
+from utils.message_store import BUCKET_COLLECTION
+from utils.resume_cache import RESUME_CACHE_TTL_SECONDS
+
+load_dotenv()
+
+DB_ENSURE_INDEXES = os.getenv("DB_ENSURE_INDEXES", "true").lower() == "true"
+
+# IndexOptionsConflict / IndexKeySpecsConflict
+_CONFLICT_CODES = (85, 86)
+
+# (collection, keys, options); `_id` is indexed by MongoDB and not listed
+INDEXES = [
+    # Daily-question pool reads and top-ups by (subject, date)
+    ("dqs", [("subject", 1), ("date", 1)], {"name": "subject_date"}),
+    # Incremental sync of the near-duplicate question index
+    ("dqs", [("subject", 1), ("_id", 1)], {"name": "subject_id"}),
+    # Keyset pagination of /assistant/history
+    ("assistants", [("user", 1), ("createdAt", -1), ("_id", -1)], {"name": "user_createdAt_id"}),
+    # Fallback interview sessions are addressed by sessionId; Node.js interviews have none
+    ("interviews", [("sessionId", 1)], {"name": "sessionId", "sparse": True}),
+    (BUCKET_COLLECTION, [("kind", 1), ("session", 1), ("seq", 1)], {"name": "kind_session_seq", "unique": True}),
+    ("jobs", [("expiresAt", 1)], {"name": "expiresAt_ttl", "expireAfterSeconds": 0}),
+    ("jobs", [("status", 1), ("createdAt", 1)], {"name": "status_createdAt"}),
+    # Daily-question top-up leases; a lease left by a crashed process is removed once expired
+    ("dq_leases", [("expiresAt", 1)], {"name": "expiresAt_ttl", "expireAfterSeconds": 0}),
+    ("resume_texts", [("createdAt", 1)], {"name": "createdAt_ttl", "expireAfterSeconds": RESUME_CACHE_TTL_SECONDS}),
+]
+
+# Placeholders only; the plan does not depend on whether anything matches
+_ID = ObjectId()
+
+HOT_QUERIES = [
+    {"name": "users by _id (auth)", "collection": "users", "filter": {"_id": _ID}},
+    {"name": "dqs by subject and date", "collection": "dqs", "filter": {"subject": "DBMS", "date": "2025-01-01"}},
+    {"name": "dqs index sync", "collection": "dqs", "filter": {"subject": "DBMS", "_id": {"$gt": _ID}}, "sort": {"_id": 1}},
+    {"name": "assistants by _id and user", "collection": "assistants", "filter": {"_id": _ID, "user": _ID}},
+    {"name": "assistants history page", "collection": "assistants", "filter": {"user": _ID}, "sort": {"createdAt": -1, "_id": -1}},
+    {"name": "interviews by _id", "collection": "interviews", "filter": {"_id": _ID}},
+    {"name": "interviews by _id or sessionId", "collection": "interviews", "filter": {"$or": [{"_id": _ID}, {"sessionId": str(_ID)}]}},
+    {"name": "interviews by sessionId", "collection": "interviews", "filter": {"sessionId": "fallback-session"}},
+    {"name": "message buckets range", "collection": BUCKET_COLLECTION, "filter": {"kind": "assistants", "session": _ID, "seq": {"$gte": 0, "$lte": 1}}, "sort": {"seq": 1}},
+    {"name": "queued jobs", "collection": "jobs", "filter": {"status": QUEUED}, "sort": {"createdAt": 1}},
+    {"name": "resume text by key", "collection": "resume_texts", "filter": {"_id": "0" * 64 + ".pdf"}},
+]
+
+async def _update_ttl(db, collection: str, keys: list, options: dict) -> bool:
+    """
+    Bring an existing TTL index to the configured expireAfterSeconds.
+    Returns False if the conflict is not a TTL change.
+    """
+    async for index in db[collection].list_indexes():
+        if list(index["key"].items()) == keys and "expireAfterSeconds" in index:
+            await db.command("collMod", collection, index={
+                "keyPattern": dict(keys),
+                "expireAfterSeconds": options["expireAfterSeconds"]
+            })
+            return True
+    return False
+
+async def ensure_indexes(db, collections: list = None) -> dict:
+    """
+    Create every manifest index (optionally only for `collections`).
+    Failures are reported per index and never raised, so a bad index cannot
+    keep the service from starting. Returns {"ensured": [...], "failed": [...]}.
+    """
+    ensured, failed = [], []
+    for collection, keys, options in INDEXES:
+        if collections and collection not in collections:
+            continue
+        label = f"{collection}.{options['name']}"
+        try:
+            try:
+                await db[collection].create_index(keys, **options)
+            except OperationFailure as e:
+                if e.code not in _CONFLICT_CODES or "expireAfterSeconds" not in options \
+                        or not await _update_ttl(db, collection, keys, options):
+                    raise
+            ensured.append(label)
+        except Exception as e:
+            print(f"Error creating index {label}: {str(e)}")
+            failed.append(label)
+    return {"ensured": ensured, "failed": failed}
+
+def _stages(plan):
+    """
+    Every stage name in an explain plan, including the nested inputStage(s)
+    and the slot-based engine's queryPlan wrapper.
+    """
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+async def explain_query(db, collection: str, filter: dict, sort: dict = None) -> list:
+    """
+    The stages of the winning plan for a find, from explain in queryPlanner mode.
+    """
+    command = {"find": collection, "filter": filter}
+    if sort:
+        command["sort"] = sort
+    result = await db.command("explain", command, verbosity="queryPlanner")
+    return list(_stages(result["queryPlanner"]["winningPlan"]))
+
+async def check_query_plans(db, queries: list = None) -> list:
+    """
+    Explain each hot-path query and return one report per query:
+    {"name", "collection", "stages", "collscan"}.
+    """
+    reports = []
+    for query in queries or HOT_QUERIES:
+        stages = await explain_query(db, query["collection"], query["filter"], query.get("sort"))
+        reports.append({
+            "name": query["name"],
+            "collection": query["collection"],
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages
+        })
+    return reports
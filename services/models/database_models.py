@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union
 from datetime import datetime
 from bson import ObjectId
 
@@ -28,6 +28,11 @@ class InterviewQnA(BaseModel):
     answer: str = Field(..., description="User's answer")
     created_at: datetime = Field(default_factory=datetime.now)
 
+class InterviewMessage(BaseModel):
+    role: str = Field(..., description="Speaker: interviewer or candidate")
+    content: str = Field(..., description="Message text")
+    created_at: datetime = Field(default_factory=datetime.now, alias="createdAt")
+
 class ScoreEntry(BaseModel):
     dq: PyObjectId = Field(..., description="Reference to Daily Question")
     score: int = Field(..., description="Score achieved")
@@ -77,7 +82,11 @@ class Interview(BaseModel):
     domain: str = Field(..., description="Interview domain/field")
     difficulty: str = Field(..., description="Difficulty level: easy, medium, hard")
     qna: List[InterviewQnA] = Field(default=[], description="Question and Answer pairs", alias="QnA")
-    feedback: str = Field(default="", description="Interview feedback")
+    recent_history: List[InterviewMessage] = Field(default=[], description="Bounded rolling history used to build prompts", alias="recentHistory")
+    history_summary: str = Field(default="", description="Summary of turns older than the rolling history", alias="historySummary")
+    summarized_through: Optional[int] = Field(default=None, description="Index of the last QnA entry covered by the summary", alias="summarizedThrough")
+    feedback: Optional[Union[Dict, str]] = Field(default=None, description="Interview feedback", alias="feedBack")
+    feedback_fingerprint: Optional[str] = Field(default=None, description="Hash of the QnA the stored feedback was generated from", alias="feedbackFingerprint")
     score: int = Field(default=0, description="Interview score")
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
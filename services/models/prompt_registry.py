@@ -0,0 +1,132 @@
+"""
+Precompiled prompt templates.
+
+Every template in models/prompts.py is parsed once at import: placeholders are
+validated against the fields each prompt family expects, and the text is split
+into static and dynamic segments so rendering is a single join. Domain prompts
+are resolved from a flat (mode, domain) table with a generic fallback.
+"""
+
+from string import Formatter
+from utils.prompt_builder import count_tokens
+from models.prompts import (
+    daily_questions_prompt,
+    resume_prompt,
+    study_assistant_prompt,
+    feedback_prompt,
+    resume_based_interviewer_prompt,
+    hr_resume_interviewer_prompt,
+    data_science_resume_interviewer_prompt,
+    webdev_resume_interviewer_prompt,
+    full_technical_resume_interviewer_prompt,
+    hr_general_interviewer_prompt,
+    data_science_general_interviewer_prompt,
+    webdev_general_interviewer_prompt,
+    full_technical_general_interviewer_prompt,
+    hr_feedback_prompt,
+    data_science_feedback_prompt,
+    webdev_feedback_prompt,
+    full_technical_feedback_prompt,
+    interview_summary_prompt
+)
+
+# mode -> (required fields, optional fields)
+TEMPLATE_FIELDS = {
+    "daily_questions": ({"subject"}, set()),
+    "resume_analysis": ({"text"}, set()),
+    "study_assistant": ({"subject", "textbook", "history"}, set()),
+    "resume_interviewer": ({"difficulty", "resume_content", "history"}, {"domain"}),
+    "general_interviewer": ({"username", "difficulty", "history"}, set()),
+    "feedback": ({"difficulty", "conversation"}, {"domain"}),
+    "interview_summary": ({"domain", "difficulty", "summary", "exchanges"}, set()),
+}
+
+class PromptTemplate:
+    """
+    A validated template split into literal text and placeholder names.
+    render() produces exactly what str.format would for plain {name} fields.
+    """
+
+    __slots__ = ("name", "mode", "fields", "_literals", "_names", "static_tokens")
+
+    def __init__(self, name: str, mode: str, source: str):
+        self.name = name
+        self.mode = mode
+        literals, names = [], []
+        for literal, field, format_spec, conversion in Formatter().parse(source):
+            if field is not None:
+                if not field.isidentifier() or format_spec or conversion:
+                    raise ValueError(f"Prompt '{name}' has unsupported placeholder '{{{field}}}'.")
+            literals.append(literal)
+            names.append(field)
+        self._literals = tuple(literals)
+        self._names = tuple(names)
+        self.fields = frozenset(field for field in names if field is not None)
+        self.static_tokens = sum(count_tokens(literal) for literal in literals)
+
+        required, optional = TEMPLATE_FIELDS[mode]
+        missing = required - self.fields
+        unknown = self.fields - required - optional
+        if missing or unknown:
+            raise ValueError(
+                f"Prompt '{name}' does not match the '{mode}' fields: "
+                f"missing {sorted(missing)}, unknown {sorted(unknown)}."
+            )
+
+    def render(self, **values) -> str:
+        parts = []
+        for literal, field in zip(self._literals, self._names):
+            parts.append(literal)
+            if field is not None:
+                value = values[field]
+                parts.append(value if isinstance(value, str) else str(value))
+        return "".join(parts)
+
+    def __repr__(self):
+        return f"PromptTemplate({self.name!r}, mode={self.mode!r})"
+
+def _compile(mode: str, templates: dict) -> dict:
+    return {key: PromptTemplate(name, mode, source) for key, (name, source) in templates.items()}
+
+# (mode, domain) -> template; domain None is the fallback for the mode
+PROMPT_REGISTRY = {}
+
+for _mode, _templates in {
+    "daily_questions": {None: ("daily_questions_prompt", daily_questions_prompt)},
+    "resume_analysis": {None: ("resume_prompt", resume_prompt)},
+    "study_assistant": {None: ("study_assistant_prompt", study_assistant_prompt)},
+    "interview_summary": {None: ("interview_summary_prompt", interview_summary_prompt)},
+    "resume_interviewer": {
+        None: ("resume_based_interviewer_prompt", resume_based_interviewer_prompt),
+        "hr": ("hr_resume_interviewer_prompt", hr_resume_interviewer_prompt),
+        "dataScience": ("data_science_resume_interviewer_prompt", data_science_resume_interviewer_prompt),
+        "webdev": ("webdev_resume_interviewer_prompt", webdev_resume_interviewer_prompt),
+        "fullTechnical": ("full_technical_resume_interviewer_prompt", full_technical_resume_interviewer_prompt),
+    },
+    "general_interviewer": {
+        None: ("hr_general_interviewer_prompt", hr_general_interviewer_prompt),
+        "hr": ("hr_general_interviewer_prompt", hr_general_interviewer_prompt),
+        "dataScience": ("data_science_general_interviewer_prompt", data_science_general_interviewer_prompt),
+        "webdev": ("webdev_general_interviewer_prompt", webdev_general_interviewer_prompt),
+        "fullTechnical": ("full_technical_general_interviewer_prompt", full_technical_general_interviewer_prompt),
+    },
+    "feedback": {
+        None: ("feedback_prompt", feedback_prompt),
+        "hr": ("hr_feedback_prompt", hr_feedback_prompt),
+        "dataScience": ("data_science_feedback_prompt", data_science_feedback_prompt),
+        "webdev": ("webdev_feedback_prompt", webdev_feedback_prompt),
+        "fullTechnical": ("full_technical_feedback_prompt", full_technical_feedback_prompt),
+    },
+}.items():
+    for _domain, _template in _compile(_mode, _templates).items():
+        PROMPT_REGISTRY[(_mode, _domain)] = _template
+
+def get_prompt(mode: str, domain: str = None) -> PromptTemplate:
+    """
+    Resolve the template for a prompt family and domain, falling back to the
+    family's generic template for unknown domains.
+    """
+    template = PROMPT_REGISTRY.get((mode, domain))
+    if template is None:
+        template = PROMPT_REGISTRY[(mode, None)]
+    return template
@@ -1,16 +1,15 @@
 daily_questions_prompt = (
     'You are an expert in creating daily interview questions for engineering students. '
     'Generate 10 easy to medium questions for the subject: {subject}. '
-    'Recent questions: {list}. '
-    'Do not repeat any questions from the list. '
-    'Format each question as JSON: '
+    'Cover a varied mix of topics from across the subject rather than only the most common ones. '
+    'Return a single JSON object with a "questions" array, formatting each question as: '
     '{{'
     '  "question": "Your question text here",'
     '  "option1": "Option 1",'
     '  "option2": "Option 2",'
     '  "option3": "Option 3",'
     '  "option4": "Option 4",'
-    '  "answer": "correct option",'
+    '  "answer": "the exact text of the correct option",'
     '  "subject": "subject name"'
     '}}. '
     'Return only JSON, no extra text.'
@@ -586,3 +585,20 @@ full_technical_general_interviewer_prompt = (
 )
 
 
+
+# Rolling interview history summary prompt
+interview_summary_prompt = (
+    'You maintain a running summary of a {domain} interview ({difficulty} level) so that the interviewer '
+    'can continue without the full transcript. '
+    'Merge the existing summary with the new exchanges below into one updated summary. '
+    'Rules: '
+    '- Keep every topic and question already asked so it is not repeated '
+    '- Keep the key facts, claims, technologies and examples the candidate gave '
+    '- Note the quality of each answer (strong, partial, vague, incorrect) '
+    '- Write plain prose, no headings, no JSON, at most 200 words '
+    'EXISTING SUMMARY: '
+    '{summary} '
+    'NEW EXCHANGES: '
+    '{exchanges} '
+    'Return only the updated summary.'
+)
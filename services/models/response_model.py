@@ -1,21 +1,28 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, AliasChoices, field_validator, model_validator
 from typing import Optional, List, Dict
 
 class voiceTranscript(BaseModel):
     text: str = Field(..., description="The transcribed text from the audio file.")
 
 
-class QuestionDetail(BaseModel):
-    option1: str
-    option2: str
-    option3: str
-    option4: str
-
 class DailyQuestionItem(BaseModel):
-    question: QuestionDetail
-    correct_ans: str
-    subject: str
-    created: str 
+    question: str = Field(..., min_length=1)
+    option1: str = Field(..., min_length=1)
+    option2: str = Field(..., min_length=1)
+    option3: str = Field(..., min_length=1)
+    option4: str = Field(..., min_length=1)
+    answer: str = Field(..., min_length=1, description="The correct option's text, or its key (option1-option4).")
+    subject: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_options(self):
+        options = [self.option1.strip().lower(), self.option2.strip().lower(), self.option3.strip().lower(), self.option4.strip().lower()]
+        if len(set(options)) != 4:
+            raise ValueError("The four options must be distinct.")
+        answer = self.answer.strip().lower()
+        if answer not in options and answer not in ("option1", "option2", "option3", "option4"):
+            raise ValueError("answer must match one of the four options.")
+        return self
 
 class DailyQuestionsResponse(BaseModel):
     questions: List[DailyQuestionItem]
@@ -39,7 +46,18 @@ class FeedbackDetail(BaseModel):
 
 class FeedBackResponse(BaseModel):
     feedback: FeedbackDetail
-    overall_score: int
+    overall_score: int = Field(..., ge=0, le=100)
+
+    @field_validator("overall_score", mode="before")
+    @classmethod
+    def round_score(cls, value):
+        # Models often return scores like 72.5
+        return round(value) if isinstance(value, float) else value
+
+class ResumeAnalysisResponse(BaseModel):
+    grammatical_mistakes: str
+    suggestions: str = Field(..., validation_alias=AliasChoices("suggestions", "improvement_suggestions"))
+    ats_score: float = Field(..., ge=0, le=100)
 
 class ChatResponse(BaseModel):
     response: str
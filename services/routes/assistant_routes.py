@@ -1,22 +1,53 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request, Depends
-from controllers.assistant_controller import get_daily_questions, study_assistant, analyse_resume
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request, Depends, Query
+from fastapi.responses import StreamingResponse, JSONResponse
+from controllers.assistant_controller import get_daily_questions, read_daily_questions, study_assistant, study_assistant_stream, analyse_resume
 from models.response_model import ChatResponse
 from models.request_models import ChatRequest
-from utils.helper import extract_text 
+from utils.resume_cache import get_resume_text, resume_cache_stats
+from utils.answer_cache import answer_cache_stats
+from utils.prompt_builder import prompt_token_stats
+from utils.speech_cache import speech_cache_stats
+from utils.question_index import question_index_stats
+from utils.job_queue import submit_job
+from utils.message_store import read_messages, delete_messages
+from utils.pagination import encode_cursor, before_filter
 from auth import require_auth
 from database.db_config import get_database
 from bson import ObjectId
+import datetime
+import os
 
 assistant_router = APIRouter()
 
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "50"))
+HISTORY_MAX_PAGE_SIZE = 100
+SESSION_PAGE_SIZE = int(os.getenv("SESSION_PAGE_SIZE", "50"))
+SESSION_MAX_PAGE_SIZE = 200
+
 @assistant_router.post("/daily-questions")
-async def daily_questions():
+async def daily_questions(background: bool = False):
     try:
+        if background:
+            job_id = await submit_job("daily_questions")
+            return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
         message = await get_daily_questions()
         return message
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching daily questions: {str(e)}")
 
+@assistant_router.get("/daily-questions")
+async def todays_daily_questions(subject: str = None, date: str = None):
+    """
+    Serve a day's daily questions (default: today, IST) from the pre-generated pool.
+    Optional `subject` filter; `date` is YYYY-MM-DD.
+    """
+    if date:
+        try:
+            datetime.date.fromisoformat(date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Date must be in YYYY-MM-DD format.")
+    return await read_daily_questions(subject=subject, date=date)
+
 @assistant_router.post("/chat", response_model= ChatResponse)
 async def chat(chatRequest: ChatRequest, request: Request):
     try:
@@ -43,8 +74,55 @@ async def chat(chatRequest: ChatRequest, request: Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
 
+@assistant_router.post("/chat/stream")
+async def chat_stream(chatRequest: ChatRequest, request: Request):
+    """
+    Stream the study assistant's answer as Server-Sent Events.
+    Events: `session` (session id), `token` (content delta), `done` (full response), `error`.
+    """
+    try:
+        if not chatRequest.user_query or not chatRequest.subject:
+            raise HTTPException(status_code=400, detail="Query and subject are required fields.")
+        
+        # Get user ID from the request body (sent by Node.js server)
+        user_id = str(chatRequest.user_id) if chatRequest.user_id else None
+        
+        if not user_id:
+            raise HTTPException(status_code=403, detail="User ID is required.")
+        
+        event_stream = await study_assistant_stream(
+            user_query=chatRequest.user_query,
+            subject=chatRequest.subject,
+            session_id=chatRequest.session_id,
+            user_id=user_id
+        )
+        return StreamingResponse(
+            event_stream,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
+
+@assistant_router.get("/cache/stats")
+async def cache_stats(current_user: dict = Depends(require_auth)):
+    """Hit rates and sizes of the service caches, and final prompt sizes per template"""
+    return {
+        "answers": answer_cache_stats(),
+        "speech": speech_cache_stats(),
+        "resume_texts": resume_cache_stats(),
+        "question_index": question_index_stats(),
+        "prompt_tokens": prompt_token_stats()
+    }
+
 @assistant_router.post("/resume")
-async def resume_chat(file: UploadFile = File(...), current_user: dict = Depends(require_auth)):
+async def resume_chat(file: UploadFile = File(...), background: bool = False, current_user: dict = Depends(require_auth)):
+    """
+    Analyse a resume. With `background=true` the analysis runs as a job and
+    the response is 202 with a job id to poll under /api/v1/jobs.
+    """
     try:
         if not file.filename.endswith(('.pdf', '.docx', '.txt')):
             raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a text-based document.")
@@ -52,24 +130,43 @@ async def resume_chat(file: UploadFile = File(...), current_user: dict = Depends
         # Use authenticated user ID
         user_id = current_user["_id"]
         
+        if background:
+            # Extraction is fast and cached; only the model call is deferred
+            text = await get_resume_text(file)
+            job_id = await submit_job(
+                "resume_analysis",
+                {"text": text, "filename": file.filename, "user_id": str(user_id)},
+                user_id=user_id
+            )
+            return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+        
         resume_content = await analyse_resume(file, user_id)
         return {"message": "Resume processed successfully", "content": resume_content}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resume file: {str(e)}")
     
 @assistant_router.post( "/parser")
-def parse_resume(file: UploadFile = File(...), current_user: dict = Depends(require_auth)):
+async def parse_resume(file: UploadFile = File(...), current_user: dict = Depends(require_auth)):
     try:
         if not file.filename.endswith(('.pdf', '.docx', '.txt')):
             raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a text-based document.")
-        resume_content = extract_text(file)
+        resume_content = await get_resume_text(file)
         return {"message": "Resume parsed successfully", "content": resume_content}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error parsing resume file: {str(e)}")
 
 @assistant_router.get("/history")
-async def get_chat_history(request: Request, user_id: str = None):
-    """Get user's chat history/sessions"""
+async def get_chat_history(
+    request: Request,
+    user_id: str = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    before: str = None,
+    db = Depends(get_database)
+):
+    """
+    Get user's chat history/sessions, newest first.
+    Pass the returned `next_cursor` as `before` to load the next page.
+    """
     try:
         # Use user_id from query parameter or if not available, get it from the request
         if not user_id:
@@ -77,33 +174,59 @@ async def get_chat_history(request: Request, user_id: str = None):
             
         if not user_id:
             raise HTTPException(status_code=403, detail="User ID is required.")
-        db = await get_database()
         collection = db['assistants']
         
-        # Get all sessions for the user, sorted by creation date (newest first)
+        # Keyset page on the (user, createdAt desc, _id desc) index
+        query = {"user": ObjectId(user_id)}
+        if before:
+            query.update(before_filter(before))
         sessions = await collection.find(
-            {"user": ObjectId(user_id)},
-            {"subject": 1, "createdAt": 1, "updatedAt": 1, "QnA": {"$slice": 1}}  # Only get first QnA for preview
-        ).sort("createdAt", -1).to_list(length=50)
+            query,
+            {"subject": 1, "createdAt": 1, "updatedAt": 1, "preview": 1, "QnA": {"$slice": 1}}  # Only get first QnA for preview
+        ).sort([("createdAt", -1), ("_id", -1)]).limit(limit + 1).to_list(length=limit + 1)
+        has_more = len(sessions) > limit
+        sessions = sessions[:limit]
         
         # Format sessions for frontend
         formatted_sessions = []
         for session in sessions:
+            if session.get("QnA"):
+                preview = session["QnA"][0].get("user", "New chat")
+            else:
+                # Bucketed sessions store the preview on the session itself
+                preview = session.get("preview") or "New chat"
             formatted_sessions.append({
                 "_id": str(session["_id"]),
                 "subject": session.get("subject", "Unknown"),
                 "createdAt": session.get("createdAt", ""),
                 "updatedAt": session.get("updatedAt", ""),
-                "preview": session.get("QnA", [{}])[0].get("user", "New chat") if session.get("QnA") else "New chat"
+                "preview": preview
             })
         
-        return {"sessions": formatted_sessions}
+        last = sessions[-1] if sessions else None
+        return {
+            "sessions": formatted_sessions,
+            "next_cursor": encode_cursor(last.get("createdAt"), last["_id"]) if has_more else None
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching chat history: {str(e)}")
 
 @assistant_router.get("/session/{session_id}")
-async def get_session_messages(session_id: str, request: Request, user_id: str = None):
-    """Get messages for a specific session"""
+async def get_session_messages(
+    session_id: str,
+    request: Request,
+    user_id: str = None,
+    limit: int = Query(SESSION_PAGE_SIZE, ge=1, le=SESSION_MAX_PAGE_SIZE),
+    before: int = Query(None, ge=0),
+    db = Depends(get_database)
+):
+    """
+    Get messages for a specific session, one page of turns at a time.
+    Returns the latest `limit` turns; pass the returned `next_cursor` as
+    `before` to load older ones.
+    """
     try:
         # Use user_id from query parameter or if not available, get it from the request
         if not user_id:
@@ -111,7 +234,6 @@ async def get_session_messages(session_id: str, request: Request, user_id: str =
             
         if not user_id:
             raise HTTPException(status_code=403, detail="User ID is required.")
-        db = await get_database()
         collection = db['assistants']
         
         # Validate session_id format
@@ -120,18 +242,40 @@ async def get_session_messages(session_id: str, request: Request, user_id: str =
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid session ID format")
         
-        # Get session with all messages
-        session = await collection.find_one({
-            "_id": session_obj_id,
-            "user": ObjectId(user_id)
-        })
+        # Only the requested turns leave the server: a $slice of QnA, or the covering buckets
+        sessions = await collection.aggregate([
+            {"$match": {"_id": session_obj_id, "user": ObjectId(user_id)}},
+            {"$project": {
+                "subject": 1,
+                "createdAt": 1,
+                "updatedAt": 1,
+                "bucketed": 1,
+                "messageCount": 1,
+                "total": {"$size": {"$ifNull": ["$QnA", []]}}
+            }}
+        ]).to_list(length=1)
         
-        if not session:
+        if not sessions:
             raise HTTPException(status_code=404, detail="Session not found")
+        session = sessions[0]
+        
+        total = session.get("messageCount", 0) if session.get("bucketed") else session["total"]
+        end_position = total if before is None else min(before, total)
+        first_position = max(end_position - limit, 0)
+        if end_position <= first_position:
+            qna_list = []
+        elif session.get("bucketed"):
+            qna_list = await read_messages(db, "assistants", session_obj_id, first_position, end_position)
+        else:
+            page = await collection.find_one(
+                {"_id": session_obj_id},
+                {"QnA": {"$slice": [first_position, end_position - first_position]}, "_id": 1}
+            )
+            qna_list = (page or {}).get("QnA", [])
         
         # Format messages for frontend
         messages = []
-        for qa in session.get("QnA", []):
+        for qa in qna_list:
             # Add user message
             messages.append({
                 "type": "user",
@@ -152,7 +296,8 @@ async def get_session_messages(session_id: str, request: Request, user_id: str =
                 "createdAt": session.get("createdAt", ""),
                 "updatedAt": session.get("updatedAt", "")
             },
-            "messages": messages
+            "messages": messages,
+            "next_cursor": first_position if first_position > 0 else None
         }
     except HTTPException:
         raise
@@ -160,7 +305,7 @@ async def get_session_messages(session_id: str, request: Request, user_id: str =
         raise HTTPException(status_code=500, detail=f"Error fetching session: {str(e)}")
 
 @assistant_router.delete("/session/{session_id}")
-async def delete_session(session_id: str, request: Request, user_id: str = None):
+async def delete_session(session_id: str, request: Request, user_id: str = None, db = Depends(get_database)):
     """Delete a specific session"""
     try:
         # Use user_id from query parameter or if not available, get it from the request
@@ -170,7 +315,6 @@ async def delete_session(session_id: str, request: Request, user_id: str = None)
         if not user_id:
             raise HTTPException(status_code=403, detail="User ID is required.")
         
-        db = await get_database()
         collection = db['assistants']
         
         # Validate session_id format
@@ -183,7 +327,7 @@ async def delete_session(session_id: str, request: Request, user_id: str = None)
         session = await collection.find_one({
             "_id": session_obj_id,
             "user": ObjectId(user_id)
-        })
+        }, {"bucketed": 1})
         
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -196,6 +340,8 @@ async def delete_session(session_id: str, request: Request, user_id: str = None)
         
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Session not found or already deleted")
+        if session.get("bucketed"):
+            await delete_messages(db, "assistants", session_obj_id)
         
         return {"message": "Session deleted successfully", "session_id": session_id}
     except HTTPException:
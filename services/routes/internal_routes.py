@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from auth import require_internal, invalidate_user_cache
+
+internal_router = APIRouter()
+
+@internal_router.post("/users/{user_id}/invalidate")
+async def invalidate_user(user_id: str, _: dict = Depends(require_internal)):
+    """
+    Drop a user's cached auth projection after the Node.js server changes the user.
+    """
+    invalidate_user_cache(user_id)
+    return {"invalidated": user_id}
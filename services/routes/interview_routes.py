@@ -1,9 +1,24 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request, Depends
 from models.response_model import voiceTranscript, InterviewResponse, FeedBackResponse
-from controllers.interview_controller import transcript, text_to_speech_controller, get_interview_feedback, resume_based_interviewer, general_interviewer
+from fastapi.responses import StreamingResponse, JSONResponse
+from controllers.interview_controller import (
+    transcript,
+    text_to_speech_controller,
+    get_interview_feedback,
+    resume_based_interviewer,
+    general_interviewer,
+    resume_based_interviewer_stream,
+    general_interviewer_stream,
+    load_interview_history,
+    format_interview_history,
+    save_interview_turn,
+    schedule_history_compaction
+)
 from models.request_models import TextToSpeechRequest, FeedbackRequest
 from utils.auth_middleware import require_auth_dep
 from database.db_config import get_database
+from utils.resume_cache import get_resume_text
+from utils.job_queue import submit_job
 from bson import ObjectId
 import datetime
 
@@ -31,9 +46,10 @@ async def text_to_speech(VoiceRequest: TextToSpeechRequest, current_user: dict =
         raise HTTPException(status_code=500, detail=f"Error generating speech: {str(e)}")
 
 @interview_router.post("/feedback", response_model=FeedBackResponse)
-async def feedback(feedbackRequest: FeedbackRequest, current_user: dict = Depends(require_auth_dep)):
+async def feedback(feedbackRequest: FeedbackRequest, background: bool = False, current_user: dict = Depends(require_auth_dep)):
     """
-    Generate AI-powered feedback for an interview session
+    Generate AI-powered feedback for an interview session.
+    With `background=true` the response is 202 with a job id to poll under /api/v1/jobs.
     """
     try:
         if not feedbackRequest.session:
@@ -45,6 +61,14 @@ async def feedback(feedbackRequest: FeedbackRequest, current_user: dict = Depend
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid session ID format.")
         
+        if background:
+            job_id = await submit_job(
+                "interview_feedback",
+                {"session_id": feedbackRequest.session},
+                user_id=current_user.get("_id")
+            )
+            return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+        
         # Get feedback from controller
         response = await get_interview_feedback(session_id=feedbackRequest.session)
         
@@ -69,10 +93,13 @@ async def resume_based_interview(
     difficulty: str = Form(...),
     user_response: str = Form(...),
     session: str = Form(None),
-    current_user: dict = Depends(require_auth_dep)
+    stream: bool = Form(False),
+    current_user: dict = Depends(require_auth_dep),
+    db = Depends(get_database)
 ):
     """
-    Resume-based interview endpoint that generates questions based on the candidate's resume and specified domain
+    Resume-based interview endpoint that generates questions based on the candidate's resume and specified domain.
+    With `stream=true` the question is sent as Server-Sent Events (`token`, `sentence`, `done`).
     """
     try:
         # Validate inputs
@@ -93,60 +120,37 @@ async def resume_based_interview(
         if isinstance(user_id, str):
             user_id = ObjectId(user_id)
         
-        # Parse resume content
-        from utils.helper import extract_text
-        resume_content = extract_text(file)
+        # Parse resume content (cached by content hash across turns)
+        resume_content = await get_resume_text(file)
         if not resume_content:
             raise HTTPException(status_code=400, detail="Could not extract text from the resume file.")
         
-        # Get or create session
-        db = await get_database()
+        # Load the bounded rolling history for this session
         collection = db['interviews']
         
+        session_history = {"filter": None, "messages": [], "seed_messages": [], "summary": ""}
         if session:
-            # Check if session is a valid ObjectId (not a fallback session)
+            session_history = await load_interview_history(collection, session)
+        history = format_interview_history(session_history["messages"], user_response, session_history["summary"])
+        
+        async def persist_turn(ai_response: str):
+            if not session_history["filter"]:
+                return
             try:
-                session_object_id = ObjectId(session)
-                # Get existing session - Node.js sessions don't filter by user_id in the lookup
-                session_doc = await collection.find_one({"_id": session_object_id})
-                if not session_doc:
-                    raise HTTPException(status_code=404, detail="Interview session not found.")
+                await save_interview_turn(collection, session_history["filter"], user_response, ai_response, session_history["seed_messages"])
+                schedule_history_compaction(collection, session_history["filter"])
             except Exception as e:
-                # Session is not a valid ObjectId (likely a fallback session)
-                # Try to find by sessionId field instead
-                session_doc = await collection.find_one({"sessionId": session})
-                if not session_doc:
-                    session_doc = None
-            
-            # Build conversation history from Node.js QnA structure
-            history = ""
-            if session_doc and "QnA" in session_doc:
-                for idx, qna in enumerate(session_doc["QnA"]):
-                    # Skip the first exchange which is the initial greeting
-                    user_msg = qna.get('user', '').strip()
-                    if (idx == 0 and (user_msg == "Hello, I am ready to start the interview." or 
-                                     user_msg == "Hello, I'm ready to start the interview. Please begin with your first question.")):
-                        continue
-                    
-                    interviewer_msg = qna.get('bot', '')
-                    candidate_msg = qna.get('user', '')
-                    if interviewer_msg and candidate_msg:
-                        history += f"Interviewer: {interviewer_msg}\\n\\nCandidate: {candidate_msg}\\n\\n"
-            
-            # Add current user response only if it's not the initial greeting
-            if (user_response.strip() != "Hello, I am ready to start the interview." and
-                user_response.strip() != "Hello, I'm ready to start the interview. Please begin with your first question."):
-                history += f"Candidate: {user_response}\\n"
-        else:
-            # For new interviews, only add the current response if it's not the initial greeting
-            if (user_response.strip() != "Hello, I am ready to start the interview." and
-                user_response.strip() != "Hello, I'm ready to start the interview. Please begin with your first question."):
-                history = f"Candidate: {user_response}\\n"
-            else:
-                history = ""
+                print(f"❌ Error saving interview turn: {str(e)}")
         
         # Generate next question
+        if stream:
+            return StreamingResponse(
+                resume_based_interviewer_stream(resume_content, domain, difficulty, history, session_id=session, on_complete=persist_turn),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
         ai_response = await resume_based_interviewer(resume_content, domain, difficulty, history)
+        await persist_turn(ai_response)
         
         return InterviewResponse(
             ai=ai_response,
@@ -167,11 +171,14 @@ async def general_interview(
     difficulty: str = Form(...),
     user_response: str = Form(...),
     session: str = Form(None),
-    current_user: dict = Depends(require_auth_dep)
+    stream: bool = Form(False),
+    current_user: dict = Depends(require_auth_dep),
+    db = Depends(get_database)
 ):
     """
     General interview endpoint for candidates who choose not to upload a resume.
     Conducts domain-specific interviews using the candidate's username for personalization.
+    With `stream=true` the question is sent as Server-Sent Events (`token`, `sentence`, `done`).
     """
     try:
         # Validate inputs
@@ -191,52 +198,32 @@ async def general_interview(
         if isinstance(user_id, str):
             user_id = ObjectId(user_id)
         
-        # Get or create session
-        db = await get_database()
+        # Load the bounded rolling history for this session
         collection = db['interviews']
         
+        session_history = {"filter": None, "messages": [], "seed_messages": [], "summary": ""}
         if session:
-            # Check if session is a valid ObjectId
+            session_history = await load_interview_history(collection, session)
+        history = format_interview_history(session_history["messages"], user_response, session_history["summary"])
+        
+        async def persist_turn(ai_response: str):
+            if not session_history["filter"]:
+                return
             try:
-                session_object_id = ObjectId(session)
-                session_doc = await collection.find_one({"_id": session_object_id})
-                if not session_doc:
-                    raise HTTPException(status_code=404, detail="Interview session not found.")
+                await save_interview_turn(collection, session_history["filter"], user_response, ai_response, session_history["seed_messages"])
+                schedule_history_compaction(collection, session_history["filter"])
             except Exception as e:
-                # Session is not a valid ObjectId (likely a fallback session)
-                session_doc = await collection.find_one({"sessionId": session})
-                if not session_doc:
-                    session_doc = None
-            
-            # Build conversation history from Node.js QnA structure
-            history = ""
-            if session_doc and "QnA" in session_doc:
-                for idx, qna in enumerate(session_doc["QnA"]):
-                    # Skip the first exchange which is the initial greeting
-                    user_msg = qna.get('user', '').strip()
-                    if (idx == 0 and (user_msg == "Hello, I am ready to start the interview." or 
-                                     user_msg == "Hello, I'm ready to start the interview. Please begin with your first question.")):
-                        continue
-                    
-                    interviewer_msg = qna.get('bot', '')
-                    candidate_msg = qna.get('user', '')
-                    if interviewer_msg and candidate_msg:
-                        history += f"Interviewer: {interviewer_msg}\\n\\nCandidate: {candidate_msg}\\n\\n"
-            
-            # Add current user response only if it's not the initial greeting
-            if (user_response.strip() != "Hello, I am ready to start the interview." and
-                user_response.strip() != "Hello, I'm ready to start the interview. Please begin with your first question."):
-                history += f"Candidate: {user_response}\\n"
-        else:
-            # For new interviews, only add the current response if it's not the initial greeting
-            if (user_response.strip() != "Hello, I am ready to start the interview." and
-                user_response.strip() != "Hello, I'm ready to start the interview. Please begin with your first question."):
-                history = f"Candidate: {user_response}\\n"
-            else:
-                history = ""
+                print(f"❌ Error saving interview turn: {str(e)}")
         
         # Generate next question using general interviewer (without resume)
+        if stream:
+            return StreamingResponse(
+                general_interviewer_stream(username, domain, difficulty, history, session_id=session, on_complete=persist_turn),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
         ai_response = await general_interviewer(username, domain, difficulty, history)
+        await persist_turn(ai_response)
         
         return InterviewResponse(
             ai=ai_response,
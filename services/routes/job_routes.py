@@ -0,0 +1,32 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from utils.job_queue import get_job, cancel_job, job_response, SUCCEEDED, FAILED, CANCELLED
+from auth import require_auth
+
+job_router = APIRouter()
+
+@job_router.get("/{job_id}")
+async def job_status(job_id: str, current_user: dict = Depends(require_auth)):
+    """Status of a background job: queued, running, succeeded, failed or cancelled"""
+    job = await get_job(job_id, current_user["_id"])
+    return job_response(job)
+
+@job_router.get("/{job_id}/result")
+async def job_result(job_id: str, current_user: dict = Depends(require_auth)):
+    """
+    Result of a finished job. Returns 202 with the status while the job is
+    queued or running, and 409 if it failed or was cancelled.
+    """
+    job = await get_job(job_id, current_user["_id"])
+    if job["status"] == SUCCEEDED:
+        return {**job_response(job), "result": job.get("result")}
+    if job["status"] in (FAILED, CANCELLED):
+        raise HTTPException(status_code=409, detail=f"Job {job['status']}: {job.get('error') or 'no result'}")
+    return JSONResponse(status_code=202, content=jsonable_encoder(job_response(job)))
+
+@job_router.post("/{job_id}/cancel")
+async def job_cancel(job_id: str, current_user: dict = Depends(require_auth)):
+    """Cancel a queued or running job"""
+    job = await cancel_job(job_id, current_user["_id"])
+    return job_response(job)
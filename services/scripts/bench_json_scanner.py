@@ -0,0 +1,99 @@
+"""
+Extraction time of JSONObjectScanner against the previous regex and
+brace-counting extractor, over model outputs.
+
+    python -m scripts.bench_json_scanner [completions.jsonl]
+
+Pass a JSONL file of {"content": ...} records (e.g. logged completions) to use
+real outputs; otherwise representative samples of each prompt's output are
+generated. Each text is also fed in 7-character chunks to check that streaming
+finds the same objects.
+"""
+
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_stream import JSONObjectScanner
+
+RUNS = 200
+
+def legacy_extract(text):
+    def fix(json_string):
+        def replace(match):
+            value = match.group(2).replace("\n", "\\n").replace("\r", "\\r").replace("\\\\n", "\\n")
+            return f'"{match.group(1)}": "{value}"'
+        return re.sub(r'"([^"]+)":\s*"((?:[^"\\]|\\.)*)(?<!\\)"', replace, json_string, flags=re.DOTALL)
+    objects = []
+    for match in re.findall(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL):
+        try:
+            objects.append(json.loads(fix(match.strip())))
+        except json.JSONDecodeError:
+            continue
+    if objects:
+        return objects
+    i = 0
+    while i < len(text):
+        if text[i] == "{":
+            depth, start = 1, i
+            i += 1
+            while i < len(text) and depth > 0:
+                depth += {"{": 1, "}": -1}.get(text[i], 0)
+                i += 1
+            if depth == 0:
+                try:
+                    objects.append(json.loads(fix(text[start:i])))
+                except json.JSONDecodeError:
+                    pass
+        else:
+            i += 1
+    return objects
+
+def scan(text):
+    scanner = JSONObjectScanner()
+    scanner.feed(text)
+    scanner.close()
+    return scanner.objects
+
+def samples():
+    question = {
+        "question": "Which data structure gives O(1) average lookup by key?",
+        "option1": "Array", "option2": "Hash table", "option3": "Linked list", "option4": "Stack",
+        "answer": "Hash table", "subject": "Data Structures"
+    }
+    yield "daily questions", json.dumps([dict(question, question=f"{question['question']} ({i})") for i in range(10)], indent=2)
+    resume = (
+        '```json\n{\n  "grammatical_mistakes": "- \'CGP A\' should be \'CGPA\'\n- use {braces} consistently",\n'
+        '  "suggestions": "### Formatting\n- Quantify achievements\n' + "- Highlight impact\n" * 40 + '",\n'
+        '  "ats_score": 72.5\n}\n```'
+    )
+    yield "resume analysis (raw newlines)", resume
+    feedback = {"feedback": "Good structure. " * 200 + "Use a map {key: value} where useful.", "score": 7}
+    yield "feedback (braces in strings)", "Here is the evaluation:\n" + json.dumps(feedback)
+    yield "malformed + prose", ("Use {curly} braces. " + "word " * 500 + '{"score": 5,} ') * 4 + json.dumps(feedback)
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            corpus = [(f"record {n}", json.loads(line)["content"]) for n, line in enumerate(f) if line.strip()]
+    else:
+        corpus = list(samples())
+
+    for label, text in corpus:
+        new_objects = scan(text)
+        old_objects = legacy_extract(text)
+        chunked = JSONObjectScanner()
+        for offset in range(0, len(text), 7):
+            chunked.feed(text[offset:offset + 7])
+        chunked.close()
+        assert chunked.objects == new_objects
+        old = min(timeit.repeat(lambda: legacy_extract(text), number=RUNS, repeat=3)) / RUNS * 1e6
+        new = min(timeit.repeat(lambda: scan(text), number=RUNS, repeat=3)) / RUNS * 1e6
+        print(f"{label:>32}: {len(text):>6} chars  legacy {old:9.1f} us ({len(old_objects)} objs)  scanner {new:8.1f} us ({len(new_objects)} objs)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Per-call cost of rendering an interviewer prompt from the registry.
+
+    python -m scripts.bench_prompt_registry
+
+Compares the old path, which rebuilt the domain map and ran str.format on
+every call, with the registry lookup and precompiled render, and checks both
+produce the same text.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.prompt_registry import get_prompt
+from models.prompts import (
+    hr_resume_interviewer_prompt,
+    data_science_resume_interviewer_prompt,
+    webdev_resume_interviewer_prompt,
+    full_technical_resume_interviewer_prompt,
+)
+
+RUNS = 100000
+VALUES = {"resume_content": "Python developer " * 200, "difficulty": "medium", "history": "Candidate: answer\n" * 40}
+
+def format_path():
+    domain_prompts = {
+        "hr": hr_resume_interviewer_prompt,
+        "dataScience": data_science_resume_interviewer_prompt,
+        "webdev": webdev_resume_interviewer_prompt,
+        "fullTechnical": full_technical_resume_interviewer_prompt
+    }
+    return domain_prompts.get("webdev").format(**VALUES)
+
+def registry_path():
+    return get_prompt("resume_interviewer", "webdev").render(**VALUES)
+
+def main():
+    assert format_path() == registry_path()
+    for label, fn in (("map + str.format", format_path), ("registry + render", registry_path)):
+        seconds = min(timeit.repeat(fn, number=RUNS, repeat=5))
+        print(f"{label:>18}: {seconds / RUNS * 1e6:.2f} us/call")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Per-turn latency of the study assistant's history read for sessions of 1, 100 and 1000 turns.
+
+    python -m scripts.bench_study_history [--uri mongodb://localhost:27017] [--mock]
+
+The read (history load plus prompt build) is timed on its own, for the
+bounded `$slice` projection and for loading the whole session as before. The
+`$push` that saves a turn is timed separately, on a copy of the session, so
+the measured sessions keep their size. The model call is left out.
+
+Runs against a real mongod at --uri (default BENCH_DB_URL or
+mongodb://localhost:27017), in a throwaway `bench_study_history` database that
+is dropped afterwards. --mock uses mongomock-motor from requirements-dev.txt
+instead; it deep-copies whole documents on every write, so its save timings
+grow with the session and say nothing about a real server.
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import time
+
+os.environ.setdefault("GROQ_API_KEY_DQ", "bench")
+os.environ.setdefault("GROQ_API_AUDIO", "bench")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.assistant_controller import _load_study_session, _build_study_messages, _save_study_turn
+
+TURN_COUNTS = (1, 100, 1000)
+ITERATIONS = 50
+BENCH_DB = "bench_study_history"
+ANSWER = "A deadlock needs mutual exclusion, hold and wait, no preemption and circular wait. " * 8
+
+async def _client(args):
+    if args.mock:
+        from mongomock_motor import AsyncMongoMockClient
+        return AsyncMongoMockClient()
+    from motor.motor_asyncio import AsyncIOMotorClient
+    client = AsyncIOMotorClient(args.uri, serverSelectionTimeoutMS=3000)
+    await client.admin.command("ping")
+    return client
+
+async def _legacy_load(collection, session):
+    session_data = await collection.find_one({"_id": session})
+    return session, [(q['user'], q['bot']) for q in session_data.get('QnA', [])]
+
+async def _slice_load(collection, session):
+    session_id, chat_history, _ = await _load_study_session(collection, "OS", str(session))
+    return session_id, chat_history
+
+async def _median_ms(operation) -> float:
+    timings = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        await operation()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+async def _read(collection, session, load):
+    chat_history = (await load(collection, session))[1]
+    _build_study_messages("What is a deadlock?", "OS", chat_history)
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--uri", default=os.getenv("BENCH_DB_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--mock", action="store_true", help="Use mongomock-motor instead of a real mongod.")
+    args = parser.parse_args()
+
+    try:
+        client = await _client(args)
+    except Exception as e:
+        print(f"Cannot reach MongoDB at {args.uri} ({str(e)}); start mongod, pass --uri, or use --mock.")
+        return 1
+    collection = client[BENCH_DB]["assistants"]
+    try:
+        print(f"{'turns':>6} {'full read (ms)':>15} {'$slice read (ms)':>17} {'save (ms)':>10}")
+        for turns in TURN_COUNTS:
+            now = datetime.datetime.now()
+            session = {"subject": "OS", "QnA": [{"user": f"question {i}", "bot": ANSWER, "createdAt": now} for i in range(turns)], "createdAt": now}
+            read_id = (await collection.insert_one(dict(session))).inserted_id
+            write_id = (await collection.insert_one(dict(session))).inserted_id
+            full = await _median_ms(lambda: _read(collection, read_id, _legacy_load))
+            sliced = await _median_ms(lambda: _read(collection, read_id, _slice_load))
+            save = await _median_ms(lambda: _save_study_turn(collection, write_id, "What is a deadlock?", "bench"))
+            print(f"{turns:>6} {full:>15.3f} {sliced:>17.3f} {save:>10.3f}")
+    finally:
+        await client.drop_database(BENCH_DB)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
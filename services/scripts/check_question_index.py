@@ -0,0 +1,37 @@
+"""
+Spot-check the near-duplicate index used for generated daily questions.
+
+    python -m scripts.check_question_index
+
+Re-punctuated and re-cased repeats of a stored question should score at or
+above DQ_DUPLICATE_THRESHOLD; distinct questions should not.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.question_index import MinHashIndex
+
+STORED = (
+    "What is the time complexity of binary search on a sorted array?",
+    "Which layer of the OSI model is responsible for routing?",
+)
+CANDIDATES = (
+    "What is the time complexity of binary search in a sorted array ?",
+    "what is the TIME complexity of binary search on a sorted array",
+    "Which OSI layer is responsible for routing packets?",
+    "What is a deadlock and what are its four necessary conditions?",
+)
+
+def main():
+    index = MinHashIndex()
+    for text in STORED:
+        index.add(text)
+    for text in CANDIDATES:
+        score, match = index.similarity(text)
+        print(f"{score:.2f} duplicate={score >= index.threshold}  {text}")
+
+if __name__ == "__main__":
+    main()
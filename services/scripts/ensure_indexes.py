@@ -0,0 +1,49 @@
+"""
+Create the indexes in database/indexes.py and check the hot-path query plans.
+
+    python -m scripts.ensure_indexes [--check] [--no-create]
+
+Index creation is idempotent and also runs at app startup (unless
+DB_ENSURE_INDEXES=false). With --check every query in HOT_QUERIES is explained
+and the command exits with status 1 if any winning plan is a COLLSCAN, so it
+can gate a deploy or CI job against a real database.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import connect_to_database, close_database_connection, get_database
+from database.indexes import ensure_indexes, check_query_plans
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="Fail if a hot-path query plans to a collection scan.")
+    parser.add_argument("--no-create", action="store_true", help="Only check the plans against the existing indexes.")
+    args = parser.parse_args()
+
+    connect_to_database()
+    try:
+        db = await get_database()
+        status = 0
+        if not args.no_create:
+            result = await ensure_indexes(db)
+            print(f"Ensured {len(result['ensured'])} indexes; {len(result['failed'])} failed.")
+            for label in result["failed"]:
+                print(f"  failed: {label}")
+            status = 1 if result["failed"] else 0
+        if args.check or args.no_create:
+            for report in await check_query_plans(db):
+                verdict = "COLLSCAN" if report["collscan"] else "ok"
+                print(f"{verdict:>8}  {report['name']}: {' > '.join(report['stages'])}")
+                if report["collscan"]:
+                    status = 1
+        return status
+    finally:
+        close_database_connection()
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
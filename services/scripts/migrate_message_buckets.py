@@ -0,0 +1,79 @@
+"""
+Move embedded QnA transcripts into the bucketed layout (see utils/message_store.py).
+
+    python -m scripts.migrate_message_buckets [--kind assistants|interviews] [--dry-run]
+
+Each session's QnA array is written to `message_buckets`; the session is then
+marked `bucketed` with its `messageCount` (and, for assistants, its `preview`)
+and QnA is emptied (not unset, so Node.js readers still find an array) in a
+single update that only succeeds if QnA still has the length that was copied. Sessions written to concurrently are skipped and
+picked up by the next run, and re-running is safe.
+
+Assistant sessions are written only by this service. Interview QnA is owned by
+the Node.js server, so only interviews idle for --idle-hours are migrated; the
+service reads any QnA entries Node.js adds afterwards together with the
+buckets. Node.js endpoints that read QnA directly will not see migrated
+messages, so migrate only when those readers go through this service.
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import connect_to_database, close_database_connection, get_database
+from database.indexes import ensure_indexes
+from utils.message_store import BUCKET_COLLECTION, write_buckets, delete_messages
+
+async def migrate_session(db, kind: str, session: dict) -> bool:
+    qna_list = session.get("QnA", [])
+    await write_buckets(db, kind, session["_id"], qna_list)
+    update = {"bucketed": True, "messageCount": len(qna_list), "QnA": []}
+    if kind == "assistants":
+        update["preview"] = qna_list[0].get("user", "") if qna_list else ""
+    result = await db[kind].update_one(
+        {"_id": session["_id"], "bucketed": {"$ne": True}, "QnA": {"$size": len(qna_list)}},
+        {"$set": update}
+    )
+    if not result.modified_count:
+        # Written to since it was read; leave it for the next run
+        await delete_messages(db, kind, session["_id"])
+        return False
+    return True
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kind", choices=["assistants", "interviews"], default="assistants")
+    parser.add_argument("--idle-hours", type=float, default=24, help="Only migrate interviews not updated for this long.")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    connect_to_database()
+    try:
+        db = await get_database()
+        await ensure_indexes(db, collections=[BUCKET_COLLECTION])
+        query = {"bucketed": {"$ne": True}, "QnA": {"$exists": True}}
+        if args.kind == "interviews":
+            cutoff = datetime.datetime.now() - datetime.timedelta(hours=args.idle_hours)
+            query["$or"] = [{"updatedAt": {"$lt": cutoff}}, {"updatedAt": {"$exists": False}, "createdAt": {"$lt": cutoff}}]
+        migrated = skipped = messages = 0
+        async for session in db[args.kind].find(query, {"QnA": 1}):
+            if args.dry_run:
+                migrated += 1
+                messages += len(session.get("QnA", []))
+                continue
+            if await migrate_session(db, args.kind, session):
+                migrated += 1
+                messages += len(session.get("QnA", []))
+            else:
+                skipped += 1
+        prefix = "Would migrate" if args.dry_run else "Migrated"
+        print(f"{prefix} {migrated} {args.kind} sessions ({messages} messages); {skipped} skipped as concurrently modified.")
+    finally:
+        close_database_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Run from services/ like the app, and let controllers build their clients without real keys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY_DQ", "test-key")
+os.environ.setdefault("GROQ_API_AUDIO", "test-key")
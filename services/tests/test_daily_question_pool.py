@@ -0,0 +1,91 @@
+import asyncio
+import datetime
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+import controllers.assistant_controller as assistant_controller
+from utils.question_index import MinHashIndex
+
+SUBJECT = "operating systems"
+DATE = "2025-01-01"
+
+QUESTIONS = [
+    "What is a deadlock?",
+    "How does paging differ from segmentation?",
+    "Why does thrashing happen?",
+    "What does a context switch save?",
+    "When is a process a zombie?",
+    "What is a race condition?",
+    "How does a semaphore differ from a mutex?",
+    "What is the working-set model?",
+    "Why is round-robin scheduling preemptive?",
+    "What happens on a page fault?",
+    "What is copy-on-write?",
+    "How does the buddy allocator split memory?",
+]
+
+@pytest.fixture
+def generator(monkeypatch):
+    """
+    Stub generation with distinct questions; records how often it is called.
+    """
+    calls = []
+
+    async def generate(subject, date, limiter):
+        calls.append(subject)
+        await asyncio.sleep(0.01)
+        batch = QUESTIONS[(len(calls) - 1) * 4:][:4]
+        return [{"question": text, "subject": subject, "date": date} for text in batch]
+
+    async def question_index(collection, subject):
+        return MinHashIndex()
+
+    monkeypatch.setattr(assistant_controller, "_generate_subject_questions", generate)
+    monkeypatch.setattr(assistant_controller, "get_question_index", question_index)
+    monkeypatch.setattr(assistant_controller, "DQ_QUESTIONS_PER_SUBJECT", 6)
+    return calls
+
+def test_concurrent_top_ups_fill_a_set_once(generator):
+    async def scenario():
+        collection = AsyncMongoMockClient()["dq_pool"]["dqs"]
+        limiter = asyncio.Semaphore(4)
+        stored = await asyncio.gather(*[
+            assistant_controller._top_up_subject(collection, SUBJECT, DATE, limiter) for _ in range(3)
+        ])
+        count = await collection.count_documents({"subject": SUBJECT, "date": DATE})
+        leases = await collection.database["dq_leases"].count_documents({})
+        return sorted(stored), count, leases
+
+    stored, count, leases = asyncio.run(scenario())
+    assert stored == [0, 0, 6]
+    assert count == 6
+    assert leases == 0
+    assert len(generator) == 2
+
+def test_expired_lease_is_taken_over(generator):
+    async def scenario():
+        collection = AsyncMongoMockClient()["dq_pool"]["dqs"]
+        leases = collection.database["dq_leases"]
+        past = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=1)
+        await leases.insert_one({"_id": f"{SUBJECT}:{DATE}", "owner": "crashed", "expiresAt": past})
+        return await assistant_controller._top_up_subject(collection, SUBJECT, DATE, asyncio.Semaphore(1))
+
+    assert asyncio.run(scenario()) == 6
+
+def test_failed_attempt_keeps_earlier_questions(generator, monkeypatch):
+    generate = assistant_controller._generate_subject_questions
+
+    async def flaky(subject, date, limiter):
+        if len(generator) == 1:
+            generator.append(subject)
+            raise ValueError("model returned no JSON")
+        return await generate(subject, date, limiter)
+
+    monkeypatch.setattr(assistant_controller, "_generate_subject_questions", flaky)
+    monkeypatch.setattr(assistant_controller, "DQ_GENERATION_ATTEMPTS", 2)
+
+    async def scenario():
+        collection = AsyncMongoMockClient()["dq_pool"]["dqs"]
+        stored = await assistant_controller._top_up_subject(collection, SUBJECT, DATE, asyncio.Semaphore(1))
+        return stored, await collection.count_documents({"subject": SUBJECT, "date": DATE})
+
+    assert asyncio.run(scenario()) == (4, 4)
@@ -0,0 +1,30 @@
+import time
+import jwt
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import auth
+from routes.internal_routes import internal_router
+
+app = FastAPI()
+app.include_router(internal_router, prefix="/api/v1/internal")
+client = TestClient(app)
+
+def _token(claims: dict) -> str:
+    return jwt.encode(dict(claims, exp=time.time() + 60), auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+
+def test_invalidate_requires_internal_scope():
+    auth._user_cache.set("cached", {"_id": "u1"})
+    assert client.post("/api/v1/internal/users/u1/invalidate").status_code == 403
+    user_token = _token({"userId": "u1"})
+    response = client.post("/api/v1/internal/users/u1/invalidate", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+    assert auth._user_cache.get("cached") is not None
+
+def test_invalidate_drops_only_that_user():
+    auth._user_cache.set("first", {"_id": "u1"})
+    auth._user_cache.set("second", {"_id": "u2"})
+    token = _token({"scope": auth.INTERNAL_TOKEN_SCOPE})
+    response = client.post("/api/v1/internal/users/u1/invalidate", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert auth._user_cache.get("first") is None
+    assert auth._user_cache.get("second") == {"_id": "u2"}
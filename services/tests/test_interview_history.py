@@ -0,0 +1,127 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+import controllers.interview_controller as interview_controller
+
+LEGACY_TURNS = 30
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+@pytest.fixture
+def summaries(monkeypatch):
+    """
+    Stub the summary model; records every summary prompt it is sent.
+    """
+    prompts = []
+
+    async def chat_completion(api_key, **kwargs):
+        prompts.append(kwargs["messages"][-1]["content"])
+        return _completion(f"summary {len(prompts)}")
+
+    monkeypatch.setattr(interview_controller, "chat_completion", chat_completion)
+    return prompts
+
+def _legacy_session():
+    start = datetime.datetime(2024, 1, 1)
+    qna = [
+        {"bot": f"Q{i}", "user": f"A{i}", "createdAt": start + datetime.timedelta(minutes=i)}
+        for i in range(1, LEGACY_TURNS + 1)
+    ]
+    qna.append({"bot": f"Q{LEGACY_TURNS + 1}", "user": "", "createdAt": start + datetime.timedelta(minutes=LEGACY_TURNS + 1)})
+    return {"domain": "hr", "difficulty": "easy", "QnA": qna}
+
+async def _turn(collection, session_id, number):
+    """
+    One interview turn: the service records the answer to Q<number> and the next
+    question in the rolling history, then Node.js stores both in QnA.
+    """
+    history = await interview_controller.load_interview_history(collection, str(session_id))
+    await interview_controller.save_interview_turn(
+        collection, history["filter"], f"A{number}", f"Q{number + 1}", history["seed_messages"]
+    )
+    doc = await collection.find_one({"_id": session_id}, {"QnA": 1})
+    await collection.update_one({"_id": session_id}, {"$set": {f"QnA.{len(doc['QnA']) - 1}.user": f"A{number}"}})
+    await collection.update_one({"_id": session_id}, {"$push": {"QnA": {"bot": f"Q{number + 1}", "user": "", "createdAt": datetime.datetime.now()}}})
+    # Distinct turn timestamps
+    await asyncio.sleep(0.002)
+
+def test_seed_messages_get_increasing_timestamps():
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["interviews"]
+        session_id = (await collection.insert_one(_legacy_session())).inserted_id
+        await _turn(collection, session_id, LEGACY_TURNS + 1)
+        doc = await collection.find_one({"_id": session_id})
+        times = [message["createdAt"] for message in doc["recentHistory"]]
+        seeded = times[:-2]
+        assert len(set(seeded)) == len(seeded)
+        assert seeded == sorted(seeded) and seeded[-1] < times[-2]
+
+    asyncio.run(run())
+
+def test_compaction_of_legacy_session_covers_every_answer(summaries):
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["interviews"]
+        session_id = (await collection.insert_one(_legacy_session())).inserted_id
+
+        # The first turn seeds the last INTERVIEW_HISTORY_MESSAGES messages; the
+        # verbatim cutoff falls inside that seeded block
+        await _turn(collection, session_id, LEGACY_TURNS + 1)
+        await interview_controller.compact_interview_history(collection, {"_id": session_id})
+        doc = await collection.find_one({"_id": session_id})
+        assert len(doc["recentHistory"]) == interview_controller.INTERVIEW_VERBATIM_MESSAGES
+        # A1-A10 never reached the rolling history but are summarised from QnA
+        assert "A1\n" in summaries[0] and "A10\n" in summaries[0]
+        first_through = doc["summarizedThrough"]
+        assert doc["QnA"][first_through]["user"].startswith("A")
+
+        for number in range(LEGACY_TURNS + 2, LEGACY_TURNS + 6):
+            await _turn(collection, session_id, number)
+        await interview_controller.compact_interview_history(collection, {"_id": session_id})
+        doc = await collection.find_one({"_id": session_id})
+        assert doc["summarizedThrough"] > first_through
+        # Each refresh only sends the QnA entries after the previous boundary
+        assert f"A{first_through + 1}\n" not in summaries[1]
+        assert f"A{first_through + 2}\n" in summaries[1]
+        return doc
+
+    doc = asyncio.run(run())
+    through = doc["summarizedThrough"]
+    assert doc["historySummary"] == "summary 2"
+    assert all(f"A{i}" in summaries[0] + summaries[1] for i in range(1, through + 2))
+
+def test_feedback_replaces_only_the_summarised_prefix(summaries, monkeypatch):
+    client = AsyncMongoMockClient()
+    collection = client["test"]["interviews"]
+    prompts = []
+
+    async def get_database():
+        return client["test"]
+
+    async def structured_completion(api_key, response_model, messages, **kwargs):
+        prompts.append(messages[-1]["content"])
+        notes = {"technical_knowledge": "ok", "communication_skills": "ok", "confidence": "ok", "problem_solving": "ok"}
+        return response_model.model_validate({"feedback": dict(notes, suggestions=notes), "overall_score": 70})
+
+    monkeypatch.setattr(interview_controller, "get_database", get_database)
+    monkeypatch.setattr(interview_controller, "structured_completion", structured_completion)
+
+    async def run():
+        session_id = (await collection.insert_one(_legacy_session())).inserted_id
+        for number in range(LEGACY_TURNS + 1, LEGACY_TURNS + 6):
+            await _turn(collection, session_id, number)
+        await interview_controller.compact_interview_history(collection, {"_id": session_id})
+        doc = await collection.find_one({"_id": session_id})
+        await interview_controller._get_or_generate_feedback(str(session_id))
+        return doc
+
+    doc = asyncio.run(run())
+    through = doc["summarizedThrough"]
+    prompt = prompts[0]
+    assert f"Summary of questions 1-{through + 1}: {doc['historySummary']}" in prompt
+    for index in range(through + 1, LEGACY_TURNS + 5):
+        assert f"A{index + 1}: A{index + 1}" in prompt
+    for index in range(through + 1):
+        assert f"A{index + 1}: A{index + 1}" not in prompt
@@ -0,0 +1,19 @@
+from utils.helper import extract_json_objects
+from utils.json_stream import JSONObjectScanner
+
+def test_recovers_after_unmatched_brace_in_prose():
+    assert extract_json_objects('unbalanced { here then {"k": 2}') == [{"k": 2}]
+    assert extract_json_objects('a { b { then {"x": "{"} and {"y": 1}') == [{"x": "{"}, {"y": 1}]
+
+def test_chunked_feed_matches_single_pass():
+    text = 'Sure { here: {"q": "a\nb", "n": {"m": 1}} and {"bad": 1,} then {"k": 2}'
+    chunked = JSONObjectScanner()
+    for offset in range(0, len(text), 5):
+        chunked.feed(text[offset:offset + 5])
+    chunked.close()
+    assert chunked.objects == extract_json_objects(text) == [{"q": "a\nb", "n": {"m": 1}}, {"k": 2}]
+
+def test_many_unmatched_braces_in_one_pass():
+    # Each `{` opens a level that never closes; close() reads the noted objects
+    text = "{ note " * 20000 + '{"k": 1} then {"k": 2}'
+    assert extract_json_objects(text) == [{"k": 1}, {"k": 2}]
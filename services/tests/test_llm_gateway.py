@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+import utils.llm_gateway as llm_gateway
+
+class FakeStream:
+    """
+    Stands in for the SDK's AsyncStream: yields deltas and records close().
+    """
+
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def __aiter__(self):
+        for delta in self.deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+def test_early_exit_closes_provider_stream(monkeypatch):
+    stream = FakeStream(["a", "b", "c"])
+
+    async def create(**kwargs):
+        return stream
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm_gateway, "get_llm_client", lambda api_key: client)
+    monkeypatch.setattr(llm_gateway, "_semaphores", {})
+
+    async def scenario():
+        deltas = llm_gateway.stream_chat_completion("key", model="m", messages=[])
+        first = await deltas.__anext__()
+        # What a StreamingResponse does when the client disconnects
+        await deltas.aclose()
+        return first, llm_gateway._semaphores["key"].locked()
+
+    first, held = asyncio.run(scenario())
+    assert first == "a"
+    assert stream.closed
+    assert not held
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import time
+import uuid
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from database.indexes import ensure_indexes, check_query_plans, HOT_QUERIES, _stages
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture(scope="module")
+def mongo_uri(tmp_path_factory):
+    """
+    MONGO_TEST_URI if set, otherwise a throwaway mongod from PATH; skips when neither exists.
+    """
+    uri = os.getenv("MONGO_TEST_URI")
+    if uri:
+        yield uri
+        return
+    mongod = shutil.which("mongod")
+    if not mongod:
+        pytest.skip("No mongod available; set MONGO_TEST_URI or put mongod on PATH.")
+    port = _free_port()
+    process = subprocess.Popen(
+        [mongod, "--port", str(port), "--bind_ip", "127.0.0.1", "--dbpath", str(tmp_path_factory.mktemp("mongod"))],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    uri = f"mongodb://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                MongoClient(uri, serverSelectionTimeoutMS=500).admin.command("ping")
+                break
+            except PyMongoError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    pytest.skip("mongod did not start.")
+        yield uri
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+def test_hot_queries_use_indexes(mongo_uri):
+    async def run():
+        client = AsyncIOMotorClient(mongo_uri)
+        db = client[f"query_plans_{uuid.uuid4().hex[:8]}"]
+        try:
+            result = await ensure_indexes(db)
+            assert result["failed"] == []
+            # Applying the manifest again is a no-op
+            assert (await ensure_indexes(db))["failed"] == []
+            # Collections without a secondary index still need to exist to be planned
+            for query in HOT_QUERIES:
+                if query["collection"] not in await db.list_collection_names():
+                    await db.create_collection(query["collection"])
+            return await check_query_plans(db)
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+
+    reports = asyncio.run(run())
+    assert len(reports) == len(HOT_QUERIES)
+    collscans = [f"{report['name']}: {' > '.join(report['stages'])}" for report in reports if report["collscan"]]
+    assert collscans == []
+
+def test_stages_walks_nested_plans():
+    classic = {"stage": "FETCH", "inputStage": {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}}
+    slot_based = {"queryPlan": {"stage": "SORT", "inputStage": {"stage": "IXSCAN"}}, "slotBasedPlan": {"slots": "..."}}
+    assert list(_stages(classic)) == ["FETCH", "OR", "IXSCAN", "COLLSCAN"]
+    assert list(_stages(slot_based)) == ["SORT", "IXSCAN"]
@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+import utils.speech_cache as speech_cache
+
+def _disk_tier(monkeypatch, tmp_path, max_bytes):
+    monkeypatch.setattr(speech_cache, "TTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(speech_cache, "TTS_CACHE_DISK_MAX_BYTES", max_bytes)
+    monkeypatch.setattr(speech_cache, "_disk_bytes", None)
+
+def test_overwrite_does_not_double_count(monkeypatch, tmp_path):
+    _disk_tier(monkeypatch, tmp_path, 10_000)
+    key = speech_cache.speech_cache_key("Hello", "voice", "model", "wav")
+    for _ in range(5):
+        speech_cache._write_disk(key, b"x" * 100)
+    assert speech_cache._disk_bytes == 100 == speech_cache._disk_usage()
+
+def test_concurrent_writes_keep_the_count(monkeypatch, tmp_path):
+    _disk_tier(monkeypatch, tmp_path, 5_000)
+    keys = [speech_cache.speech_cache_key(f"Question {i}", "voice", "model", "wav") for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda key: speech_cache._write_disk(key, b"x" * 100), keys))
+    assert speech_cache._disk_bytes == speech_cache._disk_usage()
+    assert speech_cache._disk_bytes <= 5_000
@@ -0,0 +1,129 @@
+"""
+Opt-in answer cache for the study assistant.
+
+Only first turns (no chat history) are cached, since later answers depend on
+the conversation. Lookups try an exact (subject, normalised query) key first
+and, when STUDY_CACHE_SEMANTIC is enabled, fall back to the most similar
+cached question of the same subject using local sentence embeddings.
+"""
+
+import asyncio
+import os
+import re
+import numpy as np
+from dotenv import load_dotenv
+from utils.cache import LRUCache
+
+load_dotenv()
+
+STUDY_CACHE_ENABLED = os.getenv("STUDY_CACHE_ENABLED", "false").lower() == "true"
+STUDY_CACHE_MAX_ENTRIES = int(os.getenv("STUDY_CACHE_MAX_ENTRIES", "5000"))
+STUDY_CACHE_TTL_SECONDS = float(os.getenv("STUDY_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+STUDY_CACHE_SEMANTIC = os.getenv("STUDY_CACHE_SEMANTIC", "false").lower() == "true"
+STUDY_CACHE_SIMILARITY = float(os.getenv("STUDY_CACHE_SIMILARITY", "0.92"))
+STUDY_CACHE_EMBEDDING_MODEL = os.getenv("STUDY_CACHE_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+_answers = LRUCache(max_entries=STUDY_CACHE_MAX_ENTRIES, ttl=STUDY_CACHE_TTL_SECONDS)
+# subject -> (normalised queries, matrix of their unit embeddings, one row each)
+_vectors = {}
+_embedder = None
+_metrics = {"lookups": 0, "exact_hits": 0, "semantic_hits": 0}
+
+def normalise_query(query: str) -> str:
+    query = re.sub(r"[^\w\s]", " ", query.lower())
+    return " ".join(query.split())
+
+def _get_embedder():
+    """
+    Lazily load the local embedding model. Returns None (and disables the
+    semantic tier) if the optional dependencies are not installed.
+    """
+    global _embedder, STUDY_CACHE_SEMANTIC
+    if _embedder is None:
+        try:
+            from langchain_huggingface import HuggingFaceEmbeddings
+            _embedder = HuggingFaceEmbeddings(
+                model_name=STUDY_CACHE_EMBEDDING_MODEL,
+                encode_kwargs={"normalize_embeddings": True}
+            )
+        except Exception as e:
+            print(f"Semantic study cache disabled: {str(e)}")
+            STUDY_CACHE_SEMANTIC = False
+            return None
+    return _embedder
+
+async def _embed(text: str):
+    embedder = _get_embedder()
+    if embedder is None:
+        return None
+    return await asyncio.to_thread(embedder.embed_query, text)
+
+async def get_cached_answer(subject: str, query: str):
+    """
+    Return a cached answer for a first-turn query, or None on a miss.
+    """
+    if not STUDY_CACHE_ENABLED:
+        return None
+    _metrics["lookups"] += 1
+    normalised = normalise_query(query)
+    answer = _answers.get((subject, normalised))
+    if answer is not None:
+        _metrics["exact_hits"] += 1
+        return answer
+    if not STUDY_CACHE_SEMANTIC:
+        return None
+
+    keys, matrix = _vectors.get(subject, ([], None))
+    if not keys:
+        return None
+    vector = await _embed(normalised)
+    if vector is None:
+        return None
+    # Embeddings are normalised, so the dot product is the cosine similarity
+    scores = matrix @ np.asarray(vector, dtype=np.float32)
+    best = int(np.argmax(scores))
+    if scores[best] < STUDY_CACHE_SIMILARITY:
+        return None
+    answer = _answers.get((subject, keys[best]))
+    if answer is None:
+        # Expired or evicted from the answer tier
+        _remove_vector(subject, best)
+        return None
+    _metrics["semantic_hits"] += 1
+    return answer
+
+def _remove_vector(subject: str, index: int):
+    keys, matrix = _vectors[subject]
+    del keys[index]
+    _vectors[subject] = (keys, np.delete(matrix, index, axis=0))
+
+async def store_answer(subject: str, query: str, answer: str):
+    """
+    Cache the answer to a first-turn query.
+    """
+    if not STUDY_CACHE_ENABLED or not answer:
+        return
+    normalised = normalise_query(query)
+    _answers.set((subject, normalised), answer)
+    if STUDY_CACHE_SEMANTIC:
+        keys, matrix = _vectors.get(subject, ([], None))
+        if normalised in keys:
+            return
+        vector = await _embed(normalised)
+        if vector is None:
+            return
+        row = np.asarray(vector, dtype=np.float32)[np.newaxis, :]
+        _vectors[subject] = (keys + [normalised], row if matrix is None else np.vstack([matrix, row]))
+        # Keep the vector index in step with the bounded answer tier
+        if len(_vectors[subject][0]) > STUDY_CACHE_MAX_ENTRIES:
+            _remove_vector(subject, 0)
+
+def answer_cache_stats() -> dict:
+    hits = _metrics["exact_hits"] + _metrics["semantic_hits"]
+    return {
+        "enabled": STUDY_CACHE_ENABLED,
+        "semantic": STUDY_CACHE_SEMANTIC,
+        "entries": len(_answers),
+        **_metrics,
+        "hit_rate": round(hits / _metrics["lookups"], 4) if _metrics["lookups"] else 0.0,
+    }
@@ -0,0 +1,85 @@
+"""
+Small in-process LRU cache with optional TTL and size bound.
+"""
+
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by entry count and, optionally, by a
+    total size computed with `sizeof`. Entries older than `ttl` seconds are
+    treated as missing. Not thread-safe; meant for use on the event loop.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = None, max_size: int = None, sizeof=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sizeof = sizeof or (lambda value: 1)
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, size, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        size = self.sizeof(value)
+        if self.max_size is not None and size > self.max_size:
+            return
+        if key in self._data:
+            self._remove(key)
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, size, expires_at)
+        self._size += size
+        while len(self._data) > self.max_entries or (self.max_size is not None and self._size > self.max_size):
+            self._remove(next(iter(self._data)))
+
+    def delete(self, key):
+        if key in self._data:
+            self._remove(key)
+
+    def delete_where(self, predicate):
+        """
+        Remove every entry whose value satisfies predicate(value).
+        """
+        for key in [key for key, (value, _, _) in self._data.items() if predicate(value)]:
+            self._remove(key)
+
+    def clear(self):
+        self._data.clear()
+        self._size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "size": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, key):
+        _, size, _ = self._data.pop(key)
+        self._size -= size
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,103 @@
+"""
+Process pool for CPU-bound document parsing.
+
+PyPDF2 / python-docx parsing runs in worker processes so that a large upload
+never stalls the event loop. Jobs are bounded by file size and a timeout. A
+job that times out cannot be cancelled inside its worker, so the pool is torn
+down, its processes are killed, and a fresh pool takes the next job.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from dotenv import load_dotenv
+from utils.helper import extract_text_from_bytes
+
+load_dotenv()
+
+DOC_EXTRACT_WORKERS = int(os.getenv("DOC_EXTRACT_WORKERS", str(min(2, os.cpu_count() or 1))))
+DOC_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("DOC_EXTRACT_TIMEOUT_SECONDS", "20"))
+DOC_EXTRACT_MAX_BYTES = int(os.getenv("DOC_EXTRACT_MAX_BYTES", str(10 * 1024 * 1024)))
+
+_executor: ProcessPoolExecutor = None
+
+def get_document_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Workers are spawned, not forked from the threaded event-loop process
+        _executor = ProcessPoolExecutor(
+            max_workers=DOC_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+def _kill_executor(executor: ProcessPoolExecutor):
+    """
+    Terminate a pool whose worker is stuck, and let the next job start a new one.
+    """
+    global _executor
+    if _executor is executor:
+        _executor = None
+    if hasattr(executor, "terminate_workers"):
+        executor.terminate_workers()
+        return
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+
+def shutdown_document_executor():
+    """
+    Stop the worker processes. Called on app shutdown.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def run_in_document_executor(func, *args, timeout: float = None):
+    """
+    Run func(*args) in the pool, killing the pool if it overruns `timeout`
+    (default DOC_EXTRACT_TIMEOUT_SECONDS) so the stuck worker frees its slot.
+    A job whose pool was killed because of another job is retried once.
+    """
+    timeout = DOC_EXTRACT_TIMEOUT_SECONDS if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = get_document_executor()
+        future = loop.run_in_executor(executor, func, *args)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            _kill_executor(executor)
+            raise
+        except BrokenProcessPool:
+            if attempt:
+                raise
+
+async def extract_text_async(content: bytes, filename: str) -> str:
+    """
+    Extract text from raw file bytes in the document process pool.
+    Raises HTTPException 413 for oversized files, 504 on timeout and 400 on parse errors.
+    """
+    if len(content) > DOC_EXTRACT_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File {filename} is too large. Maximum size is {DOC_EXTRACT_MAX_BYTES // (1024 * 1024)} MB."
+        )
+    try:
+        return await run_in_document_executor(extract_text_from_bytes, content, filename)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Timed out extracting text from file {filename}."
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to extract text from file {filename}: {str(e)}"
+        )
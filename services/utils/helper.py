@@ -1,162 +1,105 @@
 import json
-import re
+import os
 from PyPDF2 import PdfReader
 from docx import Document
 import requests
 import io
 from fastapi import HTTPException
+from utils.json_stream import JSONObjectScanner
+
+# Upper bound on extracted document text (roughly 4 characters per token)
+DOC_EXTRACT_MAX_CHARS = int(os.getenv("DOC_EXTRACT_MAX_CHARS", "24000"))
 
 def extract_json_objects(text: str):
     """
     Extracts all JSON objects from the given text and returns them as a list of dicts.
-    Handles both raw JSON and JSON wrapped in markdown code blocks.
-    Also handles multiline strings that need proper escaping.
+    Handles both raw JSON and JSON wrapped in markdown code blocks, braces inside
+    string values, and unescaped newlines in multiline strings.
     """
-    import json
-    import re
-    
-    # First, try to extract JSON from markdown code blocks
-    code_block_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-    code_block_matches = re.findall(code_block_pattern, text, re.DOTALL)
-    
-    json_objects = []
-    
-    # Try to parse JSON from code blocks first
-    for match in code_block_matches:
-        try:
-            # Try to fix common JSON issues with multiline strings
-            fixed_match = fix_multiline_json_strings(match.strip())
-            obj = json.loads(fixed_match)
-            json_objects.append(obj)
-        except json.JSONDecodeError:
-            continue
-    
-    # If no valid JSON found in code blocks, try to find raw JSON objects
-    if not json_objects:
-        # Simple pattern to match JSON objects - find balanced braces
-        def find_json_objects(text):
-            results = []
-            i = 0
-            while i < len(text):
-                if text[i] == '{':
-                    # Found start of potential JSON object
-                    brace_count = 1
-                    start = i
-                    i += 1
-                    
-                    while i < len(text) and brace_count > 0:
-                        if text[i] == '{':
-                            brace_count += 1
-                        elif text[i] == '}':
-                            brace_count -= 1
-                        i += 1
-                    
-                    if brace_count == 0:
-                        # Found complete JSON object
-                        json_candidate = text[start:i]
-                        results.append(json_candidate)
-                else:
-                    i += 1
-            return results
-        
-        potential_json_objects = find_json_objects(text)
-        
-        for json_candidate in potential_json_objects:
-            try:
-                # Try to fix multiline string issues
-                fixed_match = fix_multiline_json_strings(json_candidate)
-                obj = json.loads(fixed_match)
-                json_objects.append(obj)
-            except json.JSONDecodeError:
-                continue
-    
-    return json_objects
+    scanner = JSONObjectScanner()
+    scanner.feed(text)
+    scanner.close()
+    return scanner.objects
 
 
-def fix_multiline_json_strings(json_string: str) -> str:
+def format_sse(event: str, data) -> str:
     """
-    Fixes common issues with multiline strings in JSON responses from AI.
+    Format a single Server-Sent Event. The payload is JSON encoded so that
+    newlines inside model output never break the event framing.
     """
-    import re
-    
-    # Pattern to match string values that might contain unescaped newlines
-    def replace_unescaped_newlines(match):
-        full_match = match.group(0)
-        key = match.group(1)
-        value = match.group(2)
-        
-        # Replace actual newlines with \n
-        escaped_value = value.replace('\n', '\\n').replace('\r', '\\r')
-        # Fix any double escaping
-        escaped_value = escaped_value.replace('\\\\n', '\\n')
-        
-        return f'"{key}": "{escaped_value}"'
-    
-    # Pattern to match "key": "value with possible newlines"
-    pattern = r'"([^"]+)":\s*"((?:[^"\\]|\\.)*)(?<!\\)"'
-    
-    # Replace unescaped newlines in string values
-    fixed_json = re.sub(pattern, replace_unescaped_newlines, json_string, flags=re.DOTALL)
-    
-    return fixed_json
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
-def extract_text(file):
+def iter_pdf_text(content: bytes):
     """
-    Extract text content from uploaded files (PDF, DOCX, TXT)
+    Yield the text of a PDF one page at a time, so callers can stop early.
     """
-    try:
-        content = file.file.read()
-        filename = file.filename.lower()
+    reader = PdfReader(io.BytesIO(content))
+    for page in reader.pages:
+        yield page.extract_text() or ''
+
+
+def iter_docx_text(content: bytes):
+    """
+    Yield the text of a DOCX one paragraph at a time.
+    """
+    doc = Document(io.BytesIO(content))
+    for para in doc.paragraphs:
+        yield para.text
+
+
+def join_text_within_budget(pieces, max_chars: int = None) -> str:
+    """
+    Join text pieces with newlines, consuming the iterator only until
+    max_chars characters have been collected. The result is built once.
+    """
+    if max_chars is None:
+        max_chars = DOC_EXTRACT_MAX_CHARS
+    collected = []
+    total = 0
+    for piece in pieces:
+        if max_chars and total + len(piece) >= max_chars:
+            collected.append(piece[:max_chars - total])
+            break
+        collected.append(piece)
+        total += len(piece) + 1
+    return '\n'.join(collected)
+
+
+def extract_text_from_bytes(content: bytes, filename: str, max_chars: int = None):
+    """
+    Extract text content from the raw bytes of an uploaded file (PDF, DOCX, TXT).
+    PDF and DOCX parsing stops once max_chars (default DOC_EXTRACT_MAX_CHARS) is reached.
+    """
+    filename = filename.lower()
+    
+    if filename.endswith('.pdf'):
+        # Handle PDF
+        return join_text_within_budget(iter_pdf_text(content), max_chars).strip()
         
-        if filename.endswith('.pdf'):
-            # Handle PDF
-            pdf_file = io.BytesIO(content)
-            reader = PdfReader(pdf_file)
-            text = ''
-            for page in reader.pages:
-                text += page.extract_text() + '\n'
-            return text.strip()
-            
-        elif filename.endswith('.docx'):
-            # Handle DOCX
-            docx_file = io.BytesIO(content)
-            doc = Document(docx_file)
-            text = ''
-            for para in doc.paragraphs:
-                text += para.text + '\n'
-            return text.strip()
-            
-        elif filename.endswith('.txt'):
-            # Handle plain text
+    elif filename.endswith('.docx'):
+        # Handle DOCX
+        return join_text_within_budget(iter_docx_text(content), max_chars).strip()
+        
+    elif filename.endswith('.txt'):
+        # Handle plain text
+        try:
+            text = content.decode('utf-8')
+        except UnicodeDecodeError:
             try:
-                text = content.decode('utf-8')
+                text = content.decode('latin-1')
             except UnicodeDecodeError:
-                try:
-                    text = content.decode('latin-1')
-                except UnicodeDecodeError:
-                    text = content.decode('utf-8', errors='ignore')
+                text = content.decode('utf-8', errors='ignore')
+        return text.strip()
+        
+    else:
+        # Fallback: try to read as text
+        try:
+            text = content.decode('utf-8')
             return text.strip()
-            
-        else:
-            # Fallback: try to read as text
-            try:
-                text = content.decode('utf-8')
-                return text.strip()
-            except UnicodeDecodeError:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Unsupported file type or encoding: {filename}"
-                )
-            
-    except Exception as e:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Failed to extract text from file {file.filename}: {str(e)}"
-        )
-    finally:
-        # Reset file pointer for potential future reads
-        file.file.seek(0)
+        except UnicodeDecodeError:
+            # Plain exception so the error pickles back from worker processes
+            raise ValueError(f"Unsupported file type or encoding: {filename}")
 
 
 def extract_text_from_url(url: str):
@@ -170,21 +113,11 @@ def extract_text_from_url(url: str):
         
         if 'pdf' in content_type or url.lower().endswith('.pdf'):
             # Handle PDF
-            pdf_file = io.BytesIO(response.content)
-            reader = PdfReader(pdf_file)
-            text = ''
-            for page in reader.pages:
-                text += page.extract_text() or ''
-            return text
+            return join_text_within_budget(iter_pdf_text(response.content))
             
         elif 'document' in content_type or url.lower().endswith('.docx'):
             # Handle DOCX
-            docx_file = io.BytesIO(response.content)
-            doc = Document(docx_file)
-            text = ''
-            for para in doc.paragraphs:
-                text += para.text + '\n'
-            return text
+            return join_text_within_budget(iter_docx_text(response.content))
             
         elif 'text' in content_type or url.lower().endswith('.txt'):
             # Handle plain text
@@ -0,0 +1,230 @@
+"""
+In-process background job runner backed by a Mongo `jobs` collection.
+
+Slow model calls are submitted as jobs: submit_job() stores the job and
+returns its id at once, and a bounded pool of asyncio workers runs it. Each
+job document records its status (queued, running, succeeded, failed,
+cancelled), attempts, result and error. Failed attempts are retried with
+backoff; finished jobs expire after JOB_RESULT_TTL_SECONDS through a TTL index.
+Jobs are claimed with an atomic status update, so several processes can share
+the collection, and jobs interrupted by a restart are picked up again.
+"""
+
+import asyncio
+import datetime
+import os
+from bson import ObjectId
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from database.db_config import get_database
+
+load_dotenv()
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "2"))
+JOB_RESULT_TTL_SECONDS = int(os.getenv("JOB_RESULT_TTL_SECONDS", str(24 * 3600)))
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "300"))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+# kind -> async handler(**params) returning a BSON-serialisable result
+_handlers = {}
+_queue = None
+_workers = []
+_running = {}
+# Ids of running jobs cancelled through cancel_job, as opposed to worker shutdown
+_cancelled = set()
+
+def register_job(kind: str, handler):
+    _handlers[kind] = handler
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+async def _jobs_collection():
+    db = await get_database()
+    return db['jobs']
+
+def _enqueue(job_id, delay: float = 0):
+    if _queue is None:
+        return
+    if delay:
+        asyncio.get_running_loop().call_later(delay, _queue.put_nowait, job_id)
+    else:
+        _queue.put_nowait(job_id)
+
+async def submit_job(kind: str, params: dict = None, user_id: str = None, max_attempts: int = None) -> str:
+    """
+    Store a job and queue it for the worker pool. Returns the job id.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind '{kind}'.")
+    collection = await _jobs_collection()
+    now = _now()
+    job = {
+        "kind": kind,
+        "params": params or {},
+        "user": str(user_id) if user_id else None,
+        "status": QUEUED,
+        "attempts": 0,
+        "maxAttempts": max_attempts or JOB_MAX_ATTEMPTS,
+        "result": None,
+        "error": None,
+        "createdAt": now,
+        "updatedAt": now,
+    }
+    inserted = await collection.insert_one(job)
+    _enqueue(inserted.inserted_id)
+    return str(inserted.inserted_id)
+
+async def get_job(job_id: str, user_id: str = None) -> dict:
+    """
+    Return a job document, hiding other users' jobs behind a 404.
+    """
+    try:
+        _id = ObjectId(job_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid job ID format.")
+    collection = await _jobs_collection()
+    job = await collection.find_one({"_id": _id}, {"params": 0})
+    if not job or (job.get("user") and user_id and job["user"] != str(user_id)):
+        raise HTTPException(status_code=404, detail="Job not found.")
+    job["_id"] = str(job["_id"])
+    return job
+
+async def cancel_job(job_id: str, user_id: str = None) -> dict:
+    """
+    Cancel a queued or running job. Finished jobs are returned unchanged.
+    """
+    job = await get_job(job_id, user_id)
+    if job["status"] in FINISHED:
+        return job
+    collection = await _jobs_collection()
+    now = _now()
+    await collection.update_one(
+        {"_id": ObjectId(job_id), "status": {"$in": [QUEUED, RUNNING]}},
+        {"$set": {
+            "status": CANCELLED,
+            "updatedAt": now,
+            "expiresAt": now + datetime.timedelta(seconds=JOB_RESULT_TTL_SECONDS)
+        }}
+    )
+    task = _running.get(job_id)
+    if task is not None:
+        _cancelled.add(job_id)
+        task.cancel()
+    return await get_job(job_id, user_id)
+
+async def _finish(collection, job_id, status: str, **fields):
+    now = _now()
+    await collection.update_one(
+        {"_id": job_id, "status": RUNNING},
+        {"$set": {
+            "status": status,
+            "updatedAt": now,
+            "expiresAt": now + datetime.timedelta(seconds=JOB_RESULT_TTL_SECONDS),
+            **fields
+        }}
+    )
+
+async def _run(job_id):
+    collection = await _jobs_collection()
+    # Claim atomically so a job is never run twice
+    job = await collection.find_one_and_update(
+        {"_id": job_id, "status": QUEUED},
+        {"$set": {"status": RUNNING, "updatedAt": _now()}, "$inc": {"attempts": 1}},
+        return_document=True
+    )
+    if job is None:
+        return
+    handler = _handlers.get(job["kind"])
+    if handler is None:
+        await _finish(collection, job_id, FAILED, error=f"Unknown job kind '{job['kind']}'.")
+        return
+
+    task = asyncio.ensure_future(asyncio.wait_for(handler(**job["params"]), JOB_TIMEOUT_SECONDS))
+    _running[str(job_id)] = task
+    try:
+        result = await task
+    except asyncio.CancelledError:
+        if str(job_id) not in _cancelled:
+            raise  # The worker itself is shutting down; the job is requeued on restart
+        _cancelled.discard(str(job_id))
+        return  # cancel_job already set the status
+    except Exception as e:
+        error = e.detail if isinstance(e, HTTPException) else str(e) or type(e).__name__
+        # Client errors will fail the same way again
+        retryable = not (isinstance(e, HTTPException) and e.status_code < 500)
+        if retryable and job["attempts"] < job["maxAttempts"]:
+            print(f"Job {job_id} ({job['kind']}) attempt {job['attempts']} failed, retrying: {error}")
+            await collection.update_one(
+                {"_id": job_id, "status": RUNNING},
+                {"$set": {"status": QUEUED, "error": error, "updatedAt": _now()}}
+            )
+            _enqueue(job_id, JOB_RETRY_BACKOFF_SECONDS * 2 ** (job["attempts"] - 1))
+        else:
+            print(f"Job {job_id} ({job['kind']}) failed: {error}")
+            await _finish(collection, job_id, FAILED, error=error)
+        return
+    finally:
+        _running.pop(str(job_id), None)
+    await _finish(collection, job_id, SUCCEEDED, result=result, error=None)
+
+async def _worker():
+    while True:
+        job_id = await _queue.get()
+        try:
+            await _run(job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error running job {job_id}: {str(e)}")
+        finally:
+            _queue.task_done()
+
+async def start_job_workers():
+    """
+    Requeue queued jobs and jobs orphaned by a restart, and start JOB_WORKERS
+    workers. The job indexes are created with the rest in database/indexes.py.
+    """
+    global _queue
+    if _queue is not None:
+        return
+    _queue = asyncio.Queue()
+    try:
+        collection = await _jobs_collection()
+        # Running jobs not touched within the timeout were orphaned by a restart
+        stale = _now() - datetime.timedelta(seconds=JOB_TIMEOUT_SECONDS)
+        await collection.update_many(
+            {"status": RUNNING, "updatedAt": {"$lt": stale}},
+            {"$set": {"status": QUEUED, "updatedAt": _now()}}
+        )
+        async for job in collection.find({"status": QUEUED}, {"_id": 1}).sort("createdAt", 1):
+            _enqueue(job["_id"])
+    except Exception as e:
+        print(f"Error recovering queued jobs: {str(e)}")
+    _workers.extend(asyncio.create_task(_worker()) for _ in range(JOB_WORKERS))
+
+async def stop_job_workers():
+    global _queue
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
+
+def job_response(job: dict) -> dict:
+    """
+    The public view of a job, without its result.
+    """
+    return {
+        "job_id": job["_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "error": job.get("error"),
+        "created_at": job.get("createdAt"),
+        "updated_at": job.get("updatedAt"),
+    }
@@ -0,0 +1,146 @@
+"""
+Incremental, string-aware scanner for JSON objects embedded in model output.
+
+The scanner walks the text once, tracking brace depth and whether it is inside
+a string literal, so braces in strings never end an object early. Raw control
+characters inside strings and stray backslashes are repaired as they are
+copied, which replaces the old regex rewrite before json.loads. Text can be
+fed in chunks as a response streams in; each call returns the objects
+completed by that chunk, and close() at the end of input returns the objects
+that completed after an unmatched `{` in prose.
+"""
+
+import json
+import re
+
+# Characters that change state outside and inside string literals
+_STRUCTURE = re.compile(r'[{}"]')
+_STRING = re.compile(r'["\\\n\r\t]')
+
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_VALID_ESCAPES = set('"\\/bfnrtu')
+
+class JSONObjectScanner:
+    """
+    Finds top-level JSON objects in arbitrary text in a single pass.
+    Objects nested in arrays are returned individually, matching how the
+    prompts ask for one object per item. Candidates that still fail to parse
+    are skipped without rescanning. Within an open candidate, the objects that
+    complete inside each nesting level are noted as the scan goes, so close()
+    can return them without a second pass if the candidate never balances.
+    """
+
+    def __init__(self):
+        self.objects = []
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Per open nesting level: the index in _parts of its `{`, and the
+        # (start, end) part ranges of the objects completed directly inside it
+        self._opened = []
+        self._completed = []
+
+    def feed(self, chunk: str) -> list:
+        found = []
+        parts = self._parts
+        opened = self._opened
+        completed = self._completed
+        i, n = 0, len(chunk)
+        while i < n:
+            if self._depth == 0:
+                start = chunk.find("{", i)
+                if start < 0:
+                    break
+                parts.clear()
+                parts.append("{")
+                opened[:] = [0]
+                completed[:] = [[]]
+                self._depth = 1
+                i = start + 1
+            elif self._escape:
+                char = chunk[i]
+                if char in _VALID_ESCAPES:
+                    parts.append(char)
+                else:
+                    # A lone backslash: keep it as a literal backslash
+                    parts.append("\\" + _CONTROL_ESCAPES.get(char, char))
+                self._escape = False
+                i += 1
+            elif self._in_string:
+                match = _STRING.search(chunk, i)
+                if match is None:
+                    parts.append(chunk[i:])
+                    break
+                end = match.start()
+                parts.append(chunk[i:end])
+                char = chunk[end]
+                if char == '"':
+                    parts.append('"')
+                    self._in_string = False
+                elif char == "\\":
+                    parts.append("\\")
+                    self._escape = True
+                else:
+                    parts.append(_CONTROL_ESCAPES[char])
+                i = end + 1
+            else:
+                match = _STRUCTURE.search(chunk, i)
+                if match is None:
+                    parts.append(chunk[i:])
+                    break
+                end = match.start()
+                parts.append(chunk[i:end])
+                char = chunk[end]
+                i = end + 1
+                if char == '"':
+                    parts.append('"')
+                    self._in_string = True
+                elif char == "{":
+                    opened.append(len(parts))
+                    completed.append([])
+                    parts.append("{")
+                    self._depth += 1
+                else:
+                    parts.append("}")
+                    self._depth -= 1
+                    if self._depth == 0:
+                        obj = self._parse("".join(parts))
+                        parts.clear()
+                        if obj is not None:
+                            found.append(obj)
+                    else:
+                        # Replaces the objects nested inside it
+                        completed.pop()
+                        completed[-1].append((opened.pop(), len(parts)))
+        self.objects.extend(found)
+        return found
+
+    def close(self) -> list:
+        """
+        Finish the input. A candidate that never balanced opened on a `{` in
+        prose, so the outermost objects completed inside it are parsed from the
+        noted ranges instead. Returns the objects recovered this way.
+        """
+        found = []
+        if self._depth:
+            for level in self._completed:
+                for start, end in level:
+                    obj = self._parse("".join(self._parts[start:end]))
+                    if obj is not None:
+                        found.append(obj)
+        self._parts.clear()
+        self._opened.clear()
+        self._completed.clear()
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.objects.extend(found)
+        return found
+
+    @staticmethod
+    def _parse(candidate: str):
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,103 @@
+"""
+Async gateway for Groq chat completions and speech synthesis.
+
+All controllers go through this module so that completions never block the
+event loop, share one pooled HTTP client, and are capped per API key.
+"""
+
+import asyncio
+import os
+import httpx
+from groq import AsyncGroq
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+_http_client: httpx.AsyncClient = None
+_clients = {}
+_semaphores = {}
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+        )
+    return _http_client
+
+def get_llm_client(api_key: str) -> AsyncGroq:
+    """
+    Return the cached async client for an API key, sharing one connection pool.
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        client = AsyncGroq(
+            api_key=api_key,
+            http_client=_get_http_client(),
+            timeout=LLM_TIMEOUT_SECONDS,
+            max_retries=LLM_MAX_RETRIES,
+        )
+        _clients[api_key] = client
+    return client
+
+def _get_semaphore(api_key: str) -> asyncio.Semaphore:
+    semaphore = _semaphores.get(api_key)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        _semaphores[api_key] = semaphore
+    return semaphore
+
+async def chat_completion(api_key: str, **kwargs):
+    """
+    Run a chat completion without blocking the event loop.
+    At most LLM_MAX_CONCURRENCY completions are in flight per API key.
+    """
+    async with _get_semaphore(api_key):
+        return await get_llm_client(api_key).chat.completions.create(**kwargs)
+
+async def stream_chat_completion(api_key: str, **kwargs):
+    """
+    Stream a chat completion, yielding the text of each content delta as it arrives.
+    The per-key concurrency slot is held until the stream is exhausted. If the
+    caller stops early (e.g. the client disconnected), the provider stream is
+    closed at once so its connection and slot are released.
+    """
+    async with _get_semaphore(api_key):
+        stream = await get_llm_client(api_key).chat.completions.create(stream=True, **kwargs)
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+async def stream_speech(api_key: str, chunk_size: int = None, **kwargs):
+    """
+    Synthesise speech, yielding the audio bytes as they arrive instead of
+    buffering the whole file. Shares the per-key concurrency slot with completions.
+    """
+    async with _get_semaphore(api_key):
+        async with get_llm_client(api_key).audio.speech.with_streaming_response.create(**kwargs) as response:
+            async for chunk in response.iter_bytes(chunk_size):
+                yield chunk
+
+async def close_llm_clients():
+    """
+    Close the shared HTTP connection pool. Called on app shutdown.
+    """
+    global _http_client
+    _clients.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
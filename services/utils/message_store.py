@@ -0,0 +1,117 @@
+"""
+Bucketed message storage for assistant and interview transcripts.
+
+Instead of one ever-growing embedded array, a bucketed session keeps its
+messages in fixed-size documents of the `message_buckets` collection, keyed by
+(kind, session, seq), where kind is the owning collection. The session document
+only holds metadata: `bucketed: true` and `messageCount`. Every message gets a
+position from an atomic `$inc` of `messageCount`, so reads of any range, such
+as the last N messages, touch only the buckets that cover it.
+
+With MESSAGE_BUCKETS=true new study-assistant sessions are created bucketed.
+Interview QnA is written by the Node.js server, so interviews are only ever
+bucketed by the migration tool, `python -m scripts.migrate_message_buckets`.
+"""
+
+import os
+from dotenv import load_dotenv
+from pymongo import ReturnDocument
+
+load_dotenv()
+
+MESSAGE_BUCKETS = os.getenv("MESSAGE_BUCKETS", "false").lower() == "true"
+MESSAGE_BUCKET_SIZE = int(os.getenv("MESSAGE_BUCKET_SIZE", "50"))
+
+BUCKET_COLLECTION = "message_buckets"
+
+def _group_by_bucket(first_position: int, messages: list) -> dict:
+    """
+    Split messages starting at first_position into {seq: [message, ...]},
+    tagging each message with its position.
+    """
+    by_seq = {}
+    for offset, message in enumerate(messages):
+        position = first_position + offset
+        by_seq.setdefault(position // MESSAGE_BUCKET_SIZE, []).append(dict(message, pos=position))
+    return by_seq
+
+async def append_messages(db, kind: str, session_id, messages: list, session_update: dict = None) -> int:
+    """
+    Append messages to a bucketed session of db[kind] and return the new
+    messageCount. session_update ($set fields) is applied to the session
+    document in the same update that reserves the positions.
+    """
+    if not messages:
+        return None
+    update = {"$inc": {"messageCount": len(messages)}}
+    if session_update:
+        update["$set"] = session_update
+    session = await db[kind].find_one_and_update(
+        {"_id": session_id},
+        update,
+        projection={"messageCount": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if session is None:
+        return None
+    count = session["messageCount"]
+    # A turn usually fits in one bucket, at most two
+    for seq, items in _group_by_bucket(count - len(messages), messages).items():
+        await db[BUCKET_COLLECTION].update_one(
+            {"kind": kind, "session": session_id, "seq": seq},
+            {
+                "$push": {"messages": {"$each": items}},
+                "$inc": {"count": len(items)},
+                "$setOnInsert": {"firstAt": items[0].get("createdAt")},
+                "$set": {"lastAt": items[-1].get("createdAt")}
+            },
+            upsert=True
+        )
+    return count
+
+async def read_messages(db, kind: str, session_id, start: int = 0, end: int = None) -> list:
+    """
+    Return the messages at positions [start, end) in order, reading only the
+    buckets that cover that range.
+    """
+    query = {"kind": kind, "session": session_id, "seq": {"$gte": max(start, 0) // MESSAGE_BUCKET_SIZE}}
+    if end is not None:
+        if end <= start:
+            return []
+        query["seq"]["$lte"] = (end - 1) // MESSAGE_BUCKET_SIZE
+    messages = []
+    async for bucket in db[BUCKET_COLLECTION].find(query, {"messages": 1}).sort("seq", 1):
+        messages.extend(bucket.get("messages", []))
+    # Concurrent appends may land in a bucket out of order
+    messages.sort(key=lambda message: message["pos"])
+    return [message for message in messages if message["pos"] >= start and (end is None or message["pos"] < end)]
+
+async def recent_messages(db, kind: str, session_id, message_count: int, limit: int) -> list:
+    """
+    The last `limit` messages of a session whose messageCount is known.
+    """
+    return await read_messages(db, kind, session_id, max(message_count - limit, 0), message_count)
+
+async def delete_messages(db, kind: str, session_id):
+    await db[BUCKET_COLLECTION].delete_many({"kind": kind, "session": session_id})
+
+async def write_buckets(db, kind: str, session_id, messages: list):
+    """
+    Replace a session's buckets with messages at positions 0..n-1 (used by
+    the migration; safe to re-run).
+    """
+    await delete_messages(db, kind, session_id)
+    buckets = [
+        {
+            "kind": kind,
+            "session": session_id,
+            "seq": seq,
+            "messages": items,
+            "count": len(items),
+            "firstAt": items[0].get("createdAt"),
+            "lastAt": items[-1].get("createdAt")
+        }
+        for seq, items in _group_by_bucket(0, messages).items()
+    ]
+    if buckets:
+        await db[BUCKET_COLLECTION].insert_many(buckets)
@@ -0,0 +1,41 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque URL-safe strings encoding the sort key of the last item
+returned, so each page is a bounded index range scan instead of a skip.
+"""
+
+import base64
+import datetime
+import json
+from bson import ObjectId
+from fastapi import HTTPException
+
+def encode_cursor(created_at, _id) -> str:
+    value = created_at.isoformat() if isinstance(created_at, datetime.datetime) else None
+    payload = json.dumps({"t": value, "id": str(_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str):
+    """
+    Return (created_at, _id) from a cursor made by encode_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at = datetime.datetime.fromisoformat(payload["t"]) if payload.get("t") else None
+        return created_at, ObjectId(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+
+def before_filter(cursor: str, field: str = "createdAt") -> dict:
+    """
+    Match items that sort after the cursor in (field desc, _id desc) order.
+    """
+    created_at, _id = decode_cursor(cursor)
+    if created_at is None:
+        return {field: None, "_id": {"$lt": _id}}
+    return {"$or": [
+        {field: {"$lt": created_at}},
+        {field: created_at, "_id": {"$lt": _id}}
+    ]}
@@ -0,0 +1,101 @@
+"""
+Token-budgeted prompt assembly for the templates in models/prompts.py.
+
+Each variable slot is measured with a local token approximation and cut to a
+per-template budget before formatting. Only slot values are ever shortened;
+the template text itself is never touched, so the static instruction prefix
+stays byte-identical across calls and provider-side prefix caching keeps working.
+"""
+
+import math
+import re
+
+# Roughly matches how BPE tokenizers split text: words, numbers and single symbols
+_token_pattern = re.compile(r"\w+|[^\w\s]")
+
+TRUNCATION_MARKER = " [...] "
+
+# Token budget per variable slot, by template mode (see models.prompt_registry)
+PROMPT_TOKEN_BUDGETS = {
+    "daily_questions": {"subject": 32},
+    "resume_analysis": {"text": 6000},
+    "study_assistant": {"subject": 32, "textbook": 64, "history": 1500},
+    "resume_interviewer": {"domain": 16, "difficulty": 8, "resume_content": 3000, "history": 2500},
+    "general_interviewer": {"username": 32, "difficulty": 8, "history": 2500},
+    "feedback": {"domain": 16, "difficulty": 8, "conversation": 6000},
+    "interview_summary": {"domain": 16, "difficulty": 8, "summary": 400, "exchanges": 3000},
+}
+
+# Slots where the most recent text matters most, so truncation keeps the tail
+TAIL_SLOTS = {"history", "conversation", "exchanges"}
+
+# Final prompt sizes by template mode, so the budgets can be checked in production
+_token_stats = {}
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate the token count of text without a model-specific tokenizer.
+    Long words count as one token per four characters.
+    """
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _token_pattern.findall(text))
+
+def truncate_to_tokens(text: str, max_tokens: int, keep_tail: bool = False) -> str:
+    """
+    Shorten text to about max_tokens tokens, cutting on token boundaries.
+    Keeps the beginning by default, or the end when keep_tail is True.
+    """
+    if max_tokens is None or count_tokens(text) <= max_tokens:
+        return text
+    matches = list(_token_pattern.finditer(text))
+    if keep_tail:
+        matches.reverse()
+    used = 0
+    cut = 0 if keep_tail else len(text)
+    for match in matches:
+        used += max(1, math.ceil(len(match.group()) / 4))
+        if used > max_tokens:
+            break
+        cut = match.start() if keep_tail else match.end()
+    if keep_tail:
+        return TRUNCATION_MARKER.lstrip() + text[cut:]
+    return text[:cut] + TRUNCATION_MARKER.rstrip()
+
+def build_prompt(template, **values):
+    """
+    Render a PromptTemplate from models.prompt_registry, truncating each slot
+    to its budget from PROMPT_TOKEN_BUDGETS[template.mode].
+    Returns (prompt, token_count); the count adds the slot tokens to the
+    template's precomputed static token count and is recorded per mode for
+    prompt_token_stats().
+    """
+    budgets = PROMPT_TOKEN_BUDGETS.get(template.mode, {})
+    fitted = {}
+    token_count = template.static_tokens
+    for name, value in values.items():
+        text = value if isinstance(value, str) else str(value)
+        fitted[name] = truncate_to_tokens(text, budgets.get(name), keep_tail=name in TAIL_SLOTS)
+        if name in template.fields:
+            token_count += count_tokens(fitted[name])
+    _record_tokens(template.mode, token_count)
+    return template.render(**fitted), token_count
+
+def _record_tokens(mode: str, token_count: int):
+    stats = _token_stats.setdefault(mode, {"prompts": 0, "total_tokens": 0, "max_tokens": 0, "last_tokens": 0})
+    stats["prompts"] += 1
+    stats["total_tokens"] += token_count
+    stats["max_tokens"] = max(stats["max_tokens"], token_count)
+    stats["last_tokens"] = token_count
+
+def prompt_token_stats() -> dict:
+    """
+    Per template mode: prompts built, mean/max/last final token count.
+    """
+    return {
+        mode: {
+            "prompts": stats["prompts"],
+            "mean_tokens": round(stats["total_tokens"] / stats["prompts"], 1),
+            "max_tokens": stats["max_tokens"],
+            "last_tokens": stats["last_tokens"],
+        }
+        for mode, stats in _token_stats.items()
+    }
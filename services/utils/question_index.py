@@ -0,0 +1,140 @@
+"""
+Near-duplicate index for generated daily questions.
+
+Each subject keeps a MinHash/LSH index over the character shingles of every
+stored question in `dqs`. Generated questions whose estimated Jaccard
+similarity to a stored one reaches DQ_DUPLICATE_THRESHOLD are rejected, so the
+prompt no longer needs to carry the recent questions. Indexes are built lazily
+and then caught up incrementally by `_id`, so questions inserted by other
+processes are picked up too.
+"""
+
+import asyncio
+import os
+import re
+import zlib
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DQ_DUPLICATE_THRESHOLD = float(os.getenv("DQ_DUPLICATE_THRESHOLD", "0.7"))
+DQ_MINHASH_PERMUTATIONS = int(os.getenv("DQ_MINHASH_PERMUTATIONS", "128"))
+DQ_MINHASH_BANDS = int(os.getenv("DQ_MINHASH_BANDS", "32"))
+DQ_SHINGLE_SIZE = int(os.getenv("DQ_SHINGLE_SIZE", "5"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def normalise_question(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", str(text).lower()).split())
+
+class MinHashIndex:
+    """
+    MinHash signatures over character shingles, bucketed with LSH banding.
+    Candidates from shared buckets are confirmed with the signature agreement,
+    which estimates the Jaccard similarity of the shingle sets.
+    """
+
+    def __init__(self, num_perm: int = DQ_MINHASH_PERMUTATIONS, bands: int = DQ_MINHASH_BANDS,
+                 threshold: float = DQ_DUPLICATE_THRESHOLD, shingle_size: int = DQ_SHINGLE_SIZE):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        # Fixed seed: signatures must be comparable across restarts and processes
+        generator = np.random.RandomState(1)
+        self._a = generator.randint(1, _MAX_HASH, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, _MAX_HASH, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = []
+        self._texts = []
+
+    def _shingles(self, text: str) -> np.ndarray:
+        text = normalise_question(text)
+        size = self.shingle_size
+        if len(text) <= size:
+            pieces = {text}
+        else:
+            pieces = {text[i:i + size] for i in range(len(text) - size + 1)}
+        return np.fromiter((zlib.crc32(piece.encode("utf-8")) for piece in pieces), dtype=np.uint64, count=len(pieces))
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self._shingles(text)
+        # (a * h + b) mod p for every permutation and shingle, then the column minimum;
+        # h and a are below 2**32, so the product fits in uint64
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def similarity(self, text: str, signature: np.ndarray = None):
+        """
+        Return (estimated Jaccard similarity, stored text) of the closest
+        stored question among the LSH candidates, or (0.0, None).
+        """
+        signature = self.signature(text) if signature is None else signature
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+        best, best_text = 0.0, None
+        for position in candidates:
+            score = float(np.mean(self._signatures[position] == signature))
+            if score > best:
+                best, best_text = score, self._texts[position]
+        return best, best_text
+
+    def is_duplicate(self, text: str) -> bool:
+        return self.similarity(text)[0] >= self.threshold
+
+    def add(self, text: str, signature: np.ndarray = None):
+        signature = self.signature(text) if signature is None else signature
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        self._texts.append(text)
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(position)
+
+    def add_if_new(self, text: str) -> bool:
+        """
+        Add text unless it is a near-duplicate of a stored question.
+        Returns True if it was added.
+        """
+        signature = self.signature(text)
+        if self.similarity(text, signature)[0] >= self.threshold:
+            return False
+        self.add(text, signature)
+        return True
+
+    def __len__(self):
+        return len(self._texts)
+
+# subject -> [MinHashIndex, last synced _id]
+_indexes = {}
+_locks = {}
+
+async def get_question_index(collection, subject: str) -> MinHashIndex:
+    """
+    Return the subject's index, first loading any `dqs` questions stored
+    since the last sync.
+    """
+    lock = _locks.setdefault(subject, asyncio.Lock())
+    async with lock:
+        index, last_id = _indexes.get(subject) or (MinHashIndex(), None)
+        query = {"subject": subject}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        async for doc in collection.find(query, {"question": 1}).sort("_id", 1):
+            if doc.get("question"):
+                index.add(doc["question"])
+            last_id = doc["_id"]
+        _indexes[subject] = [index, last_id]
+        return index
+
+def question_index_stats() -> dict:
+    return {subject: len(index) for subject, (index, _) in _indexes.items()}
@@ -0,0 +1,87 @@
+"""
+Content-addressed cache of extracted resume text.
+
+The key is a SHA-256 of the uploaded bytes plus the file extension, so the
+same resume is parsed once no matter which route or interview turn sends it.
+Entries live in a size-bounded in-process LRU and, when RESUME_CACHE_MONGO is
+enabled, in a `resume_texts` collection that expires entries with a TTL index.
+"""
+
+import datetime
+import hashlib
+import os
+from dotenv import load_dotenv
+from database.db_config import get_database
+from utils.cache import LRUCache
+from utils.document_executor import extract_text_async
+
+load_dotenv()
+
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256"))
+RESUME_CACHE_MAX_CHARS = int(os.getenv("RESUME_CACHE_MAX_CHARS", "20000000"))
+RESUME_CACHE_MONGO = os.getenv("RESUME_CACHE_MONGO", "false").lower() == "true"
+RESUME_CACHE_TTL_SECONDS = int(os.getenv("RESUME_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+_memory_cache = LRUCache(max_entries=RESUME_CACHE_MAX_ENTRIES, max_size=RESUME_CACHE_MAX_CHARS, sizeof=len)
+
+def resume_cache_key(content: bytes, filename: str) -> str:
+    extension = os.path.splitext(filename.lower())[1]
+    return f"{hashlib.sha256(content).hexdigest()}{extension}"
+
+async def _resume_text_collection():
+    # The TTL index is created at startup from database/indexes.py
+    db = await get_database()
+    return db['resume_texts']
+
+async def _get_persisted(key: str):
+    try:
+        collection = await _resume_text_collection()
+        doc = await collection.find_one({"_id": key}, {"text": 1})
+        return doc.get("text") if doc else None
+    except Exception as e:
+        # The Mongo tier is an optimisation; fall back to parsing
+        print(f"Error reading resume text cache: {str(e)}")
+        return None
+
+async def _persist(key: str, text: str):
+    try:
+        collection = await _resume_text_collection()
+        await collection.update_one(
+            {"_id": key},
+            {"$set": {"text": text, "createdAt": datetime.datetime.now(datetime.timezone.utc)}},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Error writing resume text cache: {str(e)}")
+
+async def get_resume_text(file) -> str:
+    """
+    Return the extracted text of an uploaded resume, parsing it only on a cache miss.
+    Parsing runs in the document process pool; see extract_text_async for errors.
+    """
+    try:
+        content = await file.read()
+    finally:
+        await file.seek(0)
+    key = resume_cache_key(content, file.filename)
+
+    text = _memory_cache.get(key)
+    if text is not None:
+        return text
+
+    if RESUME_CACHE_MONGO:
+        text = await _get_persisted(key)
+        if text is not None:
+            _memory_cache.set(key, text)
+            return text
+
+    text = await extract_text_async(content, file.filename)
+
+    if text:
+        _memory_cache.set(key, text)
+        if RESUME_CACHE_MONGO:
+            await _persist(key, text)
+    return text
+
+def resume_cache_stats() -> dict:
+    return _memory_cache.stats()
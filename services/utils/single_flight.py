@@ -0,0 +1,34 @@
+"""
+Single-flight coalescing of concurrent async work.
+"""
+
+import asyncio
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers that arrive while a call
+    for the same key is in flight await that call's result instead of
+    starting their own. A caller that is cancelled (e.g. a client that
+    disconnects) does not cancel the shared call for the others.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+
+    async def do(self, key, factory):
+        """
+        Return the result of factory() for key, sharing any in-flight call.
+        factory is a zero-argument callable returning a coroutine.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def __contains__(self, key):
+        return key in self._inflight
+
+    def __len__(self):
+        return len(self._inflight)
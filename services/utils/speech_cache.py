@@ -0,0 +1,129 @@
+"""
+Content-addressed cache of synthesised speech.
+
+The key is a SHA-256 of the model, voice, audio format and normalised text, so
+the interviewer greetings and fallback questions that repeat across sessions
+are synthesised once. Audio lives in a byte-bounded in-process LRU and, when
+TTS_CACHE_DIR is set, in a disk tier of one file per key that is pruned
+oldest-first once it outgrows TTS_CACHE_DISK_MAX_BYTES.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import unicodedata
+from pathlib import Path
+from dotenv import load_dotenv
+from utils.cache import LRUCache
+
+load_dotenv()
+
+TTS_CACHE_MAX_ENTRIES = int(os.getenv("TTS_CACHE_MAX_ENTRIES", "512"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "")
+TTS_CACHE_DISK_MAX_BYTES = int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+_memory_cache = LRUCache(max_entries=TTS_CACHE_MAX_ENTRIES, max_size=TTS_CACHE_MAX_BYTES, sizeof=len)
+# Bytes in the disk tier, counted once on first write
+_disk_bytes = None
+# Writes run in asyncio.to_thread workers; guards _disk_bytes and pruning
+_disk_lock = threading.Lock()
+
+def normalise_speech_text(text: str) -> str:
+    # Case and punctuation change the prosody, so only whitespace and Unicode form are folded
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def speech_cache_key(text: str, voice: str, model: str, response_format: str) -> str:
+    material = "\0".join((model, voice, response_format, normalise_speech_text(text)))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+def _disk_path(key: str) -> Path:
+    return Path(TTS_CACHE_DIR) / key[:2] / key
+
+def _read_disk(key: str):
+    path = _disk_path(key)
+    try:
+        audio = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    # Reads refresh the mtime, which pruning uses as the recency order
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass  # Pruned since it was read
+    return audio
+
+def _disk_files():
+    # Temp files of writes in progress are neither counted nor pruned
+    return (path for path in Path(TTS_CACHE_DIR).glob("*/*") if path.suffix != ".tmp" and path.is_file())
+
+def _disk_usage() -> int:
+    return sum(path.stat().st_size for path in _disk_files())
+
+def _prune_disk(target: int):
+    # Called with _disk_lock held
+    global _disk_bytes
+    files = sorted(
+        _disk_files(),
+        key=lambda path: path.stat().st_mtime
+    )
+    for path in files:
+        if _disk_bytes <= target:
+            break
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            _disk_bytes -= size
+        except FileNotFoundError:
+            continue
+
+def _write_disk(key: str, audio: bytes):
+    global _disk_bytes
+    path = _disk_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so readers never see a partial file
+    temp_path = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+    temp_path.write_bytes(audio)
+    with _disk_lock:
+        if _disk_bytes is None:
+            _disk_bytes = _disk_usage()
+        try:
+            # An overwritten file no longer counts
+            _disk_bytes -= path.stat().st_size
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+        _disk_bytes += len(audio)
+        if _disk_bytes > TTS_CACHE_DISK_MAX_BYTES:
+            _prune_disk(int(TTS_CACHE_DISK_MAX_BYTES * 0.9))
+
+async def get_cached_speech(key: str):
+    """
+    Return the cached audio for a key from memory, then disk, or None.
+    """
+    audio = _memory_cache.get(key)
+    if audio is not None or not TTS_CACHE_DIR:
+        return audio
+    try:
+        audio = await asyncio.to_thread(_read_disk, key)
+    except Exception as e:
+        # The disk tier is an optimisation; fall back to synthesis
+        print(f"Error reading speech cache: {str(e)}")
+        return None
+    if audio is not None:
+        _memory_cache.set(key, audio)
+    return audio
+
+async def store_speech(key: str, audio: bytes):
+    if not audio:
+        return
+    _memory_cache.set(key, audio)
+    if TTS_CACHE_DIR:
+        try:
+            await asyncio.to_thread(_write_disk, key, audio)
+        except Exception as e:
+            print(f"Error writing speech cache: {str(e)}")
+
+def speech_cache_stats() -> dict:
+    return _memory_cache.stats()
@@ -0,0 +1,113 @@
+"""
+Schema-validated JSON generation on top of the LLM gateway.
+
+Completions are requested in the provider's JSON mode and validated against a
+Pydantic model. When validation fails, only the offending fields are sent back
+to the model, with the validation messages, and its corrections are patched
+into the original object; the rest of the completion is kept.
+"""
+
+import json
+import os
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from utils.helper import extract_json_objects
+from utils.llm_gateway import chat_completion
+
+load_dotenv()
+
+LLM_STRUCTURED_REPAIRS = int(os.getenv("LLM_STRUCTURED_REPAIRS", "2"))
+
+class StructuredOutputError(ValueError):
+    """
+    Raised when a completion still fails validation after the repair rounds.
+    `data` holds the last (partially repaired) object and `errors` the
+    remaining pydantic errors, so callers can salvage the valid parts.
+    """
+
+    def __init__(self, message: str, data=None, errors=None):
+        super().__init__(message)
+        self.data = data
+        self.errors = errors or []
+
+def _parse(content: str):
+    try:
+        data = json.loads(content)
+    except (TypeError, json.JSONDecodeError):
+        # Providers without JSON mode may still wrap the object in prose
+        objects = extract_json_objects(content or "")
+        data = objects[0] if objects else None
+    return data if isinstance(data, dict) else None
+
+def _path(loc) -> str:
+    return ".".join(str(part) for part in loc)
+
+def _set_path(data, loc, value):
+    """
+    Write value at loc (a pydantic error location) inside nested dicts/lists,
+    creating missing dict levels.
+    """
+    target = data
+    for part in loc[:-1]:
+        if isinstance(target, list):
+            target = target[int(part)]
+        else:
+            if not isinstance(target.get(part), (dict, list)):
+                target[part] = {}
+            target = target[part]
+    last = loc[-1]
+    if isinstance(target, list):
+        target[int(last)] = value
+    else:
+        target[last] = value
+
+def _repair_request(errors) -> str:
+    lines = [f'- "{_path(error["loc"])}": {error["msg"]}' for error in errors]
+    return (
+        "Some fields in your JSON are missing or invalid:\n" + "\n".join(lines) + "\n"
+        'Return a JSON object {"fixes": {...}} that maps each of these field paths, '
+        "exactly as written above, to its corrected value. Do not include any other fields."
+    )
+
+async def structured_completion(api_key: str, response_model, messages: list, repairs: int = None, **kwargs):
+    """
+    Run a chat completion in JSON mode and return it as a validated
+    `response_model` instance, re-asking for invalid fields at most `repairs`
+    times (default LLM_STRUCTURED_REPAIRS). Extra keyword arguments go to
+    chat_completion. Raises StructuredOutputError if the output never validates.
+    """
+    repairs = LLM_STRUCTURED_REPAIRS if repairs is None else repairs
+    kwargs.setdefault("response_format", {"type": "json_object"})
+    response = await chat_completion(api_key, messages=messages, **kwargs)
+    content = response.choices[0].message.content
+    data = _parse(content)
+    if data is None:
+        raise StructuredOutputError("The model did not return a JSON object.", data=None)
+
+    conversation = list(messages) + [{"role": "assistant", "content": content}]
+    errors = []
+    for attempt in range(repairs + 1):
+        try:
+            return response_model.model_validate(data)
+        except ValidationError as e:
+            errors = e.errors()
+        if attempt == repairs:
+            break
+        request = _repair_request(errors)
+        response = await chat_completion(api_key, messages=conversation + [{"role": "user", "content": request}], **kwargs)
+        fixes = (_parse(response.choices[0].message.content) or {}).get("fixes")
+        if not isinstance(fixes, dict):
+            continue
+        for error in errors:
+            path = _path(error["loc"])
+            if path in fixes:
+                try:
+                    _set_path(data, error["loc"], fixes[path])
+                except (IndexError, KeyError, ValueError, TypeError):
+                    continue
+    raise StructuredOutputError(
+        f"{response_model.__name__} validation failed: "
+        + "; ".join(f"{_path(error['loc'])}: {error['msg']}" for error in errors),
+        data=data,
+        errors=errors
+    )